@@ -0,0 +1,219 @@
+import asyncio
+import random
+from typing import TYPE_CHECKING
+
+import pymongo
+from pymongo.errors import PyMongoError
+
+from mongo_om.db.explain import scan_flags
+from mongo_om.db.planner import LOGICAL_OPS
+
+if TYPE_CHECKING:
+    from .collection import Collection
+
+# operators that can't use an index bound
+NOT_SELECTIVE_OPS = ("$ne", "$nin", "$not", "$exists", "$type", "$size")
+
+
+def query_shape(query: dict) -> tuple:
+    """
+    Normalize a query into its shape, (field, operator) pairs without values
+    """
+    shape = []
+    for k, val in query.items():
+        if k in LOGICAL_OPS:
+            shape.append((k, tuple(sorted((query_shape(q) for q in val), key=repr))))
+        elif k.startswith("$"):
+            shape.append((k, ""))
+        elif isinstance(val, dict) and val and all(op.startswith("$") for op in val):
+            shape.extend((k, op) for op in val)
+        else:
+            shape.append((k, "$eq"))
+    return tuple(sorted(shape, key=repr))
+
+
+class QueryStats:
+
+    def __init__(self, coll: "Collection", filter: tuple, sort: tuple):
+        self.coll = coll
+        self.filter = filter
+        self.sort = sort
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.explained = 0
+        self.collscans = 0
+        self.sorts = 0
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+    @property
+    def impact(self) -> float:
+        # time spent, weighted by the scans and in-memory sorts seen
+        if not self.explained:
+            return self.total_time
+        return self.total_time * (1 + (self.collscans + self.sorts) / self.explained)
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryStats({self.coll.name}, filter={self.filter}, sort={self.sort}, "
+            f"count={self.count}, avg_time={self.avg_time:.4f})"
+        )
+
+
+class IndexSuggestion:
+
+    def __init__(self, coll: "Collection", keys: list[tuple[str, int]]):
+        self.coll = coll
+        self.keys = keys
+        self.impact = 0.0
+        self.queries: list[QueryStats] = []
+
+    @property
+    def index(self) -> pymongo.IndexModel:
+        return pymongo.IndexModel(self.keys)
+
+    @property
+    def code(self) -> str:
+        fields = [f for f, _ in self.keys]
+        directions = {d for _, d in self.keys}
+        arg = repr(fields[0]) if len(fields) == 1 else repr(fields)
+        if directions == {pymongo.ASCENDING}:
+            return f"Index({arg})"
+        if directions == {pymongo.DESCENDING}:
+            return f"Descending({arg})"
+        return f"pymongo.IndexModel({self.keys!r})"
+
+    def __repr__(self) -> str:
+        return f"{self.coll.name}: {self.code}  # impact={self.impact:.4f}"
+
+
+class IndexAdvisor:
+    """
+    Record query shapes (leading $match and $sort stages) with their
+    frequency and latency, optionally sampling explain plans, to suggest
+    missing indexes
+    """
+
+    def __init__(self, explain_rate: float = 0.0):
+        self.explain_rate = explain_rate
+        self.stats: dict[tuple, QueryStats] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def record(
+        self,
+        coll: "Collection",
+        pipeline: list[dict],
+        elapsed: float,
+        explain: bool = True,
+    ):
+        filter, sort = _leading_stages(pipeline)
+        if not filter and not sort:
+            return
+        key = (coll.name, query_shape(filter), tuple(sort.items()))
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = QueryStats(coll, key[1], key[2])
+        stats.count += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        # sample explain plans
+        if explain and self.explain_rate > 0 and random.random() < self.explain_rate:
+            task = asyncio.ensure_future(self._explain(stats, filter, sort))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _explain(self, stats: QueryStats, filter: dict, sort: dict):
+        pipeline = [{"$match": filter}, *([{"$sort": sort}] if sort else [])]
+        try:
+            explain = await stats.coll.db._db.command(
+                {
+                    "explain": {
+                        "aggregate": stats.coll.name,
+                        "pipeline": pipeline,
+                        "cursor": {},
+                    },
+                    "verbosity": "queryPlanner",
+                }
+            )
+        except PyMongoError:
+            return
+        collscan, in_memory_sort = scan_flags(explain)
+        stats.explained += 1
+        stats.collscans += collscan
+        stats.sorts += in_memory_sort
+
+    def suggestions(self, min_count: int = 1) -> list[IndexSuggestion]:
+        """
+        Suggest indexes (equality, sort, range fields) not covered by declared
+        indexes, ranked by the impact of their queries
+        """
+        suggested: dict[tuple, IndexSuggestion] = {}
+        for stats in self.stats.values():
+            if stats.count < min_count:
+                continue
+            keys = _suggest_keys(stats.filter, stats.sort)
+            if not keys or _is_covered(stats.coll, keys):
+                continue
+            s = suggested.get((stats.coll.name, tuple(keys)))
+            if s is None:
+                s = suggested[(stats.coll.name, tuple(keys))] = IndexSuggestion(
+                    stats.coll, keys
+                )
+            s.impact += stats.impact
+            s.queries.append(stats)
+        return sorted(suggested.values(), key=lambda s: s.impact, reverse=True)
+
+    def reset(self):
+        self.stats.clear()
+
+
+def _leading_stages(pipeline: list[dict]) -> tuple[dict, dict]:
+    # stages running on the collection (before any $lookup)
+    filter, sort = {}, {}
+    for stage in pipeline[:2]:
+        if "$match" in stage and not filter and not sort:
+            filter = stage["$match"]
+        elif "$sort" in stage and not sort:
+            sort = stage["$sort"]
+        else:
+            break
+    return filter, sort
+
+
+def _suggest_keys(filter: tuple, sort: tuple) -> list[tuple[str, int]]:
+    # ESR rule: equality, sort then range fields
+    equality, ranges = [], []
+    for field, op in filter:
+        if field.startswith("$") or op in NOT_SELECTIVE_OPS:
+            continue
+        if op == "$eq" or (op == "$in" and not sort):
+            equality.append(field)
+        else:
+            ranges.append(field)
+    keys = [(f, pymongo.ASCENDING) for f in dict.fromkeys(equality)]
+    for field, direction in sort:
+        if field not in equality:
+            keys.append((field, direction))
+    for field in dict.fromkeys(ranges):
+        if field not in dict(keys):
+            keys.append((field, pymongo.ASCENDING))
+    # MONGO_ID is always indexed
+    if not keys or keys[0][0] == "_id":
+        return []
+    # on descending sorts, use descending keys
+    if sort and all(d == pymongo.DESCENDING for _, d in sort):
+        keys = [(f, pymongo.DESCENDING) for f, _ in keys]
+    return keys
+
+
+def _is_covered(coll: "Collection", keys: list[tuple[str, int]]) -> bool:
+    # declared indexes prefixed by the suggested fields
+    fields = [f for f, _ in keys]
+    for index in coll.indexes:
+        declared = list(index.document["key"])
+        if declared[: len(fields)] == fields:
+            return True
+    return False
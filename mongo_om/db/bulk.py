@@ -0,0 +1,221 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+import bson
+from bson import DEFAULT_CODEC_OPTIONS, CodecOptions
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError as PyMongoBulkWriteError
+
+from mongo_om.db.session import Session
+
+if TYPE_CHECKING:
+    from .collection import Collection
+
+# max operations and BSON bytes sent per bulk_write
+CHUNK_SIZE = 1000
+CHUNK_MAX_BYTES = 16 * (2**20)  # 16MB
+
+
+class ChunkResult:
+
+    def __init__(self, coll: "Collection", indexes: list[int]):
+        self.coll = coll
+        self.indexes = indexes
+        self.size = len(indexes)
+        self.inserted = 0
+        self.upserted = 0
+        self.matched = 0
+        self.modified = 0
+        self.deleted = 0
+        self.errors: list[dict] = []
+
+    @property
+    def failed(self) -> list[int]:
+        # indexes of failed operations (on whole collection operations)
+        return [self.indexes[e["index"]] for e in self.errors]
+
+    def _parse(self, details: dict):
+        self.inserted = details.get("nInserted", 0)
+        self.upserted = details.get("nUpserted", 0)
+        self.matched = details.get("nMatched", 0)
+        self.modified = details.get("nModified", 0)
+        self.deleted = details.get("nRemoved", 0)
+        self.errors = details.get("writeErrors", [])
+
+
+class BulkResult:
+
+    def __init__(self):
+        self.chunks: list[ChunkResult] = []
+
+    @property
+    def inserted(self) -> int:
+        return sum(c.inserted for c in self.chunks)
+
+    @property
+    def upserted(self) -> int:
+        return sum(c.upserted for c in self.chunks)
+
+    @property
+    def matched(self) -> int:
+        return sum(c.matched for c in self.chunks)
+
+    @property
+    def modified(self) -> int:
+        return sum(c.modified for c in self.chunks)
+
+    @property
+    def deleted(self) -> int:
+        return sum(c.deleted for c in self.chunks)
+
+    @property
+    def errors(self) -> list[dict]:
+        return [
+            {**e, "collection": c.coll.name, "index": c.indexes[e["index"]]}
+            for c in self.chunks
+            for e in c.errors
+        ]
+
+    @property
+    def ok(self) -> bool:
+        return not any(c.errors for c in self.chunks)
+
+    def merge(self, other: "BulkResult") -> "BulkResult":
+        self.chunks.extend(other.chunks)
+        return self
+
+
+def op_size(op, codec_options: CodecOptions = DEFAULT_CODEC_OPTIONS) -> int:
+    # approximate BSON size of an operation
+    size = 0
+    for doc in (getattr(op, "_filter", None), getattr(op, "_doc", None)):
+        if isinstance(doc, dict):
+            size += len(bson.encode(doc, codec_options=codec_options))
+    return size
+
+
+def chunk_ops(
+    ops: list,
+    chunk_size: int = CHUNK_SIZE,
+    max_bytes: int = CHUNK_MAX_BYTES,
+    codec_options: CodecOptions = DEFAULT_CODEC_OPTIONS,
+) -> list[tuple[int, list]]:
+    """
+    Split operations into (offset, chunk) bounded by count and BSON size
+    """
+    chunks = []
+    offset, chunk, chunk_bytes = 0, [], 0
+    for i, op in enumerate(ops):
+        size = op_size(op, codec_options) if max_bytes > 0 else 0
+        if chunk and (
+            len(chunk) >= chunk_size
+            or (max_bytes > 0 and chunk_bytes + size > max_bytes)
+        ):
+            chunks.append((offset, chunk))
+            offset, chunk, chunk_bytes = i, [], 0
+        chunk.append(op)
+        chunk_bytes += size
+    if chunk:
+        chunks.append((offset, chunk))
+    return chunks
+
+
+def _is_insert(chunk: list) -> bool:
+    return all(isinstance(op, InsertOne) for op in chunk)
+
+
+class BulkWriter:
+    """
+    Write collection operations in chunks, sequentially when ordered or with a
+    bounded number of in-flight chunks when unordered. Inserts are chunked
+    apart and sent through insert_many
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        max_bytes: int = CHUNK_MAX_BYTES,
+        concurrency: int = 4,
+    ):
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.concurrency = concurrency
+
+    async def write(
+        self,
+        coll: "Collection",
+        ops: list,
+        ordered: bool = True,
+        session: Session | None = None,
+    ) -> BulkResult:
+        result = BulkResult()
+        # split inserts from other operations, keeping original indexes
+        inserts = [i for i, op in enumerate(ops) if isinstance(op, InsertOne)]
+        others = [i for i, op in enumerate(ops) if not isinstance(op, InsertOne)]
+        chunks = []
+        for indexes in (inserts, others):
+            for offset, chunk in chunk_ops(
+                [ops[i] for i in indexes],
+                self.chunk_size,
+                self.max_bytes,
+                # custom types are encoded through the collection type registry
+                coll.codec_options or DEFAULT_CODEC_OPTIONS,
+            ):
+                chunks.append((indexes[offset : offset + len(chunk)], chunk))
+        # sessions can't be shared by concurrent operations
+        if ordered or session is not None:
+            for indexes, chunk in chunks:
+                res = await self._write_chunk(coll, indexes, chunk, ordered, session)
+                result.chunks.append(res)
+                if ordered and res.errors:
+                    break
+        else:
+            sem = asyncio.Semaphore(self.concurrency)
+
+            async def _write(indexes: list[int], chunk: list) -> ChunkResult:
+                async with sem:
+                    return await self._write_chunk(coll, indexes, chunk, ordered)
+
+            result.chunks.extend(
+                await asyncio.gather(*(_write(i, c) for i, c in chunks))
+            )
+        return result
+
+    async def _write_chunk(
+        self,
+        coll: "Collection",
+        indexes: list[int],
+        chunk: list,
+        ordered: bool = True,
+        session: Session | None = None,
+    ) -> ChunkResult:
+        res = ChunkResult(coll, indexes)
+        c = await coll._db_coll(session)
+        try:
+            # inserts of new data are independent, so don't order them
+            if _is_insert(chunk):
+                r = await c.insert_many(
+                    [op._doc for op in chunk],
+                    ordered=False,
+                    bypass_document_validation=True,
+                    session=session._sess if session else None,
+                )
+                res.inserted = len(r.inserted_ids)
+            else:
+                r = await c.bulk_write(
+                    chunk,
+                    ordered=ordered,
+                    bypass_document_validation=True,
+                    session=session._sess if session else None,
+                )
+                res._parse(r.bulk_api_result)
+        except PyMongoBulkWriteError as e:
+            res._parse(e.details)
+            coll._db_cache_sync(chunk, write_through=False)
+            return res
+        except Exception:
+            coll._db_cache_sync(chunk, write_through=False)
+            raise
+        # transactions may abort, so don't write-through on sessions
+        coll._db_cache_sync(chunk, write_through=session is None)
+        return res
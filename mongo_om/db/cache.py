@@ -0,0 +1,96 @@
+import time
+from collections import OrderedDict
+from typing import Any, Literal
+
+import bson
+from bson import DEFAULT_CODEC_OPTIONS, CodecOptions
+
+CachePolicy = Literal["lru", "fifo"]
+
+
+class DocumentCache:
+    """
+    In-memory cache of raw documents keyed by MONGO_ID, bounded by entries
+    count and BSON bytes size. Documents are kept encoded, so every get
+    returns a new copy
+    """
+
+    def __init__(
+        self,
+        size: int = 1024,
+        ttl: int = -1,
+        max_bytes: int = -1,
+        policy: CachePolicy = "lru",
+        codec_options: CodecOptions = DEFAULT_CODEC_OPTIONS,
+    ):
+        self.size = size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.codec_options = codec_options
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Any, tuple[bytes, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get(self, key) -> dict | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        data, expires = entry
+        # drop expired entry
+        if expires and expires < time.monotonic():
+            self._pop(key)
+            self.evictions += 1
+            self.misses += 1
+            return None
+        if self.policy == "lru":
+            self._data.move_to_end(key)
+        self.hits += 1
+        return bson.decode(data, codec_options=self.codec_options)
+
+    def set(self, key, data: dict):
+        encoded = bson.encode(data, codec_options=self.codec_options)
+        if self.max_bytes > 0 and len(encoded) > self.max_bytes:
+            self.invalidate(key)
+            return
+        self._pop(key)
+        expires = time.monotonic() + self.ttl if self.ttl > 0 else 0
+        self._data[key] = (encoded, expires)
+        self.bytes += len(encoded)
+        # evict oldest entries
+        while len(self._data) > self.size or (
+            self.max_bytes > 0 and self.bytes > self.max_bytes
+        ):
+            self._pop(next(iter(self._data)))
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._pop(key)
+
+    def clear(self):
+        self._data.clear()
+        self.bytes = 0
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= len(entry[0])
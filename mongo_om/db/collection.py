@@ -1,23 +1,71 @@
-from typing import TYPE_CHECKING, Generic, Literal, Type
+import asyncio
+import copy
+from collections import defaultdict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    Literal,
+    Type,
+)
 
 import bson
+import pydantic
 import pymongo
-from bson import CodecOptions
+from bson import DEFAULT_CODEC_OPTIONS, CodecOptions
 from motor.motor_asyncio import AsyncIOMotorCollection
-from pymongo import DeleteOne, ReplaceOne, WriteConcern
+from pymongo import (
+    DeleteMany,
+    InsertOne,
+    ReplaceOne,
+    ReturnDocument,
+    UpdateMany,
+    UpdateOne,
+    WriteConcern,
+)
 from pymongo.collation import Collation
 from pymongo.read_concern import ReadConcern
 from pymongo.read_preferences import _ServerMode
 
 from mongo_om import sync
-from mongo_om.db.cursor import Cursor
+from mongo_om.db.bulk import CHUNK_SIZE, BulkResult
+from mongo_om.db.cache import CachePolicy, DocumentCache
+from mongo_om.db.cursor import PAGE_SIZE, Cursor, ReadMode
+from mongo_om.db.expresions import Query, Sort
+from mongo_om.db.loader import Loader
+from mongo_om.db.pagination import (
+    Page,
+    build_keyset_query,
+    decode_token,
+    encode_token,
+    reverse_sort,
+)
+from mongo_om.db.planner import (
+    LOGICAL_OPS,
+    build_fetch_pipeline,
+    field_refs,
+    query_refs,
+)
+from mongo_om.db.projection import Projection, _sub_model
+from mongo_om.db.reconcile import IndexPlan, build_index_plan
 from mongo_om.db.references import (
+    Cascade,
+    Dereference,
     OnDelete,
     Ref,
-    build_dereference_pipeline,
-    get_reverse_references,
+    RefSelection,
+    build_reference_stages,
+    can_unload,
+    is_dereferenced,
+    is_loaded,
 )
 from mongo_om.db.session import Session
+from mongo_om.db.tracking import build_update
+from mongo_om.errors import BulkWriteError, PartialDataError
 from mongo_om.types import T
 
 if TYPE_CHECKING:
@@ -25,6 +73,9 @@ if TYPE_CHECKING:
 
 MONGO_ID = "_id"
 
+# max compiled dereference stages kept per collection
+STAGES_CACHE_SIZE = 256
+
 
 class Collection(Generic[T]):
 
@@ -48,9 +99,17 @@ class Collection(Generic[T]):
         capped: bool = False,
         capped_size: int = 16 * (2**20),  # 16MB
         capped_max_docs: int = -1,
+        dereference: Dereference = "lookup",
+        track_changes: bool = True,
+        cache_size: int = 0,
+        cache_ttl: int = -1,
+        cache_max_bytes: int = -1,
+        cache_policy: CachePolicy = "lru",
+        read_mode: ReadMode = "validate",
         **options,
     ):
         self.__coll__ = None
+        self.__boot__: asyncio.Future | None = None
         self.db = db
         self.model = model
         self.name = name or f"{model.__name__.lower()}s"
@@ -69,14 +128,52 @@ class Collection(Generic[T]):
         self.capped = capped
         self.capped_size = capped_size
         self.capped_max_docs = capped_max_docs
+        self.dereference = dereference
+        self.track_changes = track_changes
+        self.read_mode = read_mode
+        self.cache = (
+            DocumentCache(
+                cache_size,
+                ttl=cache_ttl,
+                max_bytes=cache_max_bytes,
+                policy=cache_policy,
+                codec_options=self.codec_options or DEFAULT_CODEC_OPTIONS,
+            )
+            if cache_size > 0
+            else None
+        )
         self._options = options
+        self._loaders: dict[str, Loader] = {}
+        self._adapters: dict[Type, pydantic.TypeAdapter] = {}
+        self._stages: dict[tuple, tuple[dict, ...]] = {}
+        self._stages_version = -1
 
-    async def _db_coll(self, session: Session | None = None) -> AsyncIOMotorCollection:
+    async def _db_coll(
+        self,
+        session: Session | None = None,
+        colls: list[str] | None = None,
+    ) -> AsyncIOMotorCollection:
         if self.__coll__ is not None:
             return self.__coll__
+        # bootstrap once, concurrent callers wait for it (and retry on errors
+        # or cancellation)
+        boot = self.__boot__
+        if (
+            boot is None
+            or boot.cancelled()
+            or (boot.done() and boot.exception() is not None)
+        ):
+            self.__boot__ = asyncio.ensure_future(self._db_init(session, colls))
+        return await asyncio.shield(self.__boot__)
 
+    async def _db_init(
+        self,
+        session: Session | None = None,
+        colls: list[str] | None = None,
+    ) -> AsyncIOMotorCollection:
         # Check if the collection exists
-        colls = await self.db._db.list_collection_names()
+        if colls is None:
+            colls = await self.db._db.list_collection_names()
         if self.name in colls:
             coll = self.db._db.get_collection(
                 self.name,
@@ -135,15 +232,327 @@ class Collection(Generic[T]):
     def _db_id_field(self) -> str:
         return self._db_field(self.id_field)
 
-    def _db_parse_data(self, data: dict) -> T:
-        return self.model.model_validate(data, by_alias=True)
+    def _db_key_field(self, field: str) -> str:
+        # stored field of a referenced (key) field
+        return MONGO_ID if field == self.id_field else self._db_field(field)
+
+    def _db_query_field(self, field: str) -> str:
+        # map id field to MONGO_ID
+        if field in (self.id_field, self._db_id_field()):
+            return MONGO_ID
+        return field
+
+    def _db_query(self, query: dict) -> dict:
+        q = {}
+        for k, val in query.items():
+            if k in LOGICAL_OPS:
+                val = [self._db_query(i) for i in val]
+            elif k == "$not":
+                val = self._db_query(val)
+            q[self._db_query_field(k)] = val
+        return q
+
+    def _db_sort(self, sort: dict) -> dict:
+        return {self._db_query_field(k): val for k, val in sort.items()}
+
+    def _db_selection(
+        self,
+        include: list[str] | None = None,
+        exclude_refs: list[str] = [],
+    ) -> RefSelection | None:
+        if include is None and not exclude_refs:
+            return None
+        return RefSelection(include, exclude_refs)
+
+    def _db_reference_stages(
+        self,
+        ref: Ref,
+        selection: RefSelection | None = None,
+        projection: Projection | None = None,
+    ) -> tuple[dict, ...]:
+        """
+        Get the dereference stages of a reference, compiled once per selection
+        and projection until the references graph changes
+        """
+        version = self.db.__refs__.version
+        if self._stages_version != version:
+            self._stages.clear()
+            self._stages_version = version
+        key = (
+            ref.field,
+            (
+                (selection.include, selection.exclude, selection.force)
+                if selection is not None
+                else None
+            ),
+            projection.paths if projection is not None else None,
+        )
+        stages = self._stages.get(key)
+        if stages is None:
+            if len(self._stages) >= STAGES_CACHE_SIZE:
+                self._stages.clear()
+            stages = tuple(
+                build_reference_stages(ref, selection, projection=projection)
+            )
+            self._stages[key] = stages
+        return stages
+
+    def _db_parse_data(
+        self,
+        data: dict,
+        selection: RefSelection | None = None,
+        read_mode: ReadMode = "validate",
+        projection: Projection | None = None,
+    ) -> T:
+        return self._db_parse_many([data], selection, read_mode, projection)[0]
+
+    def _db_parse_many(
+        self,
+        data: list[dict],
+        selection: RefSelection | None = None,
+        read_mode: ReadMode = "validate",
+        projection: Projection | None = None,
+    ) -> list[T]:
+        """
+        Parse raw data in a single pass, validated, constructed (not
+        validated) or as raw dicts. Projected data is validated as its
+        sub-model, or constructed as partial models
+        """
+        if read_mode == "raw":
+            for d in data:
+                self._db_raw(d)
+            return data  # type: ignore
+        if projection is not None and projection.model is not None:
+            for d in data:
+                self._db_raw(d)
+            return self._db_adapter(projection.model).validate_python(
+                data, by_alias=True
+            )
+        id_field = self._db_id_field()
+        for d in data:
+            # map MONGO_ID to id field
+            if MONGO_ID in d:
+                d[id_field] = d.pop(MONGO_ID)
+            if selection is not None:
+                self._db_unloaded_refs(d)
+        if read_mode == "construct" or projection is not None:
+            objs = [self._db_construct(d, projection) for d in data]
+        else:
+            objs = self._db_adapter(self.model).validate_python(data, by_alias=True)
+        for obj, d in zip(objs, data):
+            self._db_track(obj, d)
+        return objs
+
+    def _db_adapter(self, model: Type) -> pydantic.TypeAdapter:
+        # build adapters once (on first use, so forward refs are resolved)
+        if model not in self._adapters:
+            self._adapters[model] = pydantic.TypeAdapter(list[model])
+        return self._adapters[model]
+
+    def _db_construct(self, data: dict, projection: Projection | None = None) -> T:
+        # build model (and dereferenced models) without validation
+        ref_fields = {ref.field for ref in self.refs}
+        # don't share mutable values with raw data (tracking snapshot, cache)
+        values = {
+            k: v if k in ref_fields else copy.deepcopy(v) for k, v in data.items()
+        }
+        for ref in self.refs:
+            val = values.get(ref.field)
+            proj = projection.at(ref.field) if projection is not None else None
+            if ref.many and val is not None:
+                values[ref.field] = [
+                    ref.coll._db_construct(i, proj) if isinstance(i, dict) else i
+                    for i in val
+                ]
+            elif isinstance(val, dict):
+                values[ref.field] = ref.coll._db_construct(val, proj)
+        _construct_fields(self.model, values, skip=ref_fields)
+        obj = self.model.model_construct(**values)
+        # partial data, keep its loaded fields
+        if projection is not None and hasattr(obj, "_om_partial"):
+            obj._om_partial = projection.fields | {self.id_field}  # type: ignore
+        return obj
+
+    def _db_raw(self, data: dict):
+        # map MONGO_ID to id field (on dereferenced data too)
+        if MONGO_ID in data:
+            data[self._db_id_field()] = data.pop(MONGO_ID)
+        for ref in self.refs:
+            val = data.get(ref.field)
+            for i in val if ref.many and val is not None else [val]:
+                if isinstance(i, dict):
+                    ref.coll._db_raw(i)
+
+    def _db_unloaded_refs(self, data: dict):
+        # set unloaded refs on not-dereferenced values
+        for ref in self.refs:
+            if ref.field not in data and can_unload(ref.coll):
+                val = data.get(ref.local)
+                if ref.many:
+                    val = (
+                        [ref.coll._db_unloaded(ref, i) for i in val]
+                        if val is not None
+                        else val
+                    )
+                elif val is not None:
+                    val = ref.coll._db_unloaded(ref, val)
+                data[ref.field] = val
+                continue
+            # walk into dereferenced values
+            val = data.get(ref.field)
+            for i in val if ref.many else [val]:
+                if isinstance(i, dict):
+                    ref.coll._db_unloaded_refs(i)
+
+    def _db_unloaded(self, ref: Ref, val) -> T:
+        data = self.model.model_construct(**{ref.ref: val})
+        data._om_loaded = False  # type: ignore
+        data._om_persisted = True  # type: ignore
+        return data
+
+    def _db_loader(self, field: str, session: Session | None = None) -> Loader:
+        # sessions can't be shared by concurrent queries
+        if session is not None:
+            return Loader(self, field, session=session)
+        if field not in self._loaders:
+            self._loaders[field] = Loader(self, field)
+        return self._loaders[field]
+
+    async def _db_load(
+        self,
+        field: str,
+        keys: list,
+        session: Session | None = None,
+    ) -> dict:
+        """
+        Load raw data by keys, from cache (if enabled) or batched queries
+        """
+        loaded = {}
+        cache = self.cache if field == MONGO_ID and session is None else None
+        if cache is not None:
+            for k in set(keys):
+                data = cache.get(k)
+                if data is not None:
+                    loaded[k] = data
+            keys = [k for k in keys if k not in loaded]
+        if keys:
+            data = await self._db_loader(field, session).load_many(keys)
+            if cache is not None:
+                for k, d in data.items():
+                    cache.set(k, d)
+            loaded.update(data)
+        return loaded
+
+    def _db_cache_sync(self, ops: list, write_through: bool = True):
+        """
+        Write-through (or invalidate) cached data of applied operations
+        """
+        if self.cache is None:
+            return
+        for op in ops:
+            if isinstance(op, InsertOne):
+                if write_through:
+                    self.cache.set(op._doc[MONGO_ID], dict(op._doc))
+                continue
+            key = getattr(op, "_filter", {}).get(MONGO_ID)
+            if isinstance(key, dict):
+                keys = key.get("$in", [key["$eq"]] if "$eq" in key else None)
+            else:
+                keys = [key] if key is not None else None
+            # unknown affected data
+            if keys is None:
+                self.cache.clear()
+                return
+            if write_through and isinstance(op, ReplaceOne):
+                self.cache.set(key, dict(op._doc))
+                continue
+            for k in keys:
+                self.cache.invalidate(k)
+
+    def _db_pk(self, filter: dict):
+        # get MONGO_ID value of primary-key lookup filters
+        q = self._db_query(filter)
+        if len(q) != 1 or MONGO_ID not in q:
+            return None
+        val = q[MONGO_ID]
+        if isinstance(val, dict):
+            if list(val) != ["$eq"]:
+                return None
+            val = val["$eq"]
+        return val if isinstance(val, Hashable) else None
+
+    async def _db_resolve_refs(
+        self,
+        data: list[dict],
+        selection: RefSelection | None = None,
+        session: Session | None = None,
+        prefix: str = "",
+    ):
+        """
+        Dereference raw data client-side, one batched query per reference
+        """
+        refs = [
+            ref
+            for ref in self.refs
+            if is_dereferenced(ref, f"{prefix}{ref.field}", selection)
+        ]
+        await asyncio.gather(
+            *(
+                self._db_resolve_ref(ref, data, selection, session, prefix)
+                for ref in refs
+            )
+        )
+
+    async def _db_resolve_ref(
+        self,
+        ref: Ref,
+        data: list[dict],
+        selection: RefSelection | None = None,
+        session: Session | None = None,
+        prefix: str = "",
+    ):
+        foreing_f = ref.coll._db_key_field(ref.ref)
+        pending = [d for d in data if ref.field not in d]
+        keys = []
+        for d in pending:
+            val = d.get(ref.local)
+            if val is not None:
+                keys.extend(val if ref.many else [val])
+        loaded = await ref.coll._db_load(foreing_f, keys, session=session)
+        # stitch dereferenced values
+        for d in pending:
+            val = d.get(ref.local)
+            if ref.many:
+                val = [
+                    ref.coll._db_ref_data(loaded[i]) for i in val or [] if i in loaded
+                ]
+            elif val is not None:
+                val = ref.coll._db_ref_data(loaded[val]) if val in loaded else None
+            d[ref.field] = val
+        # resolve nested references
+        children = []
+        for d in data:
+            val = d.get(ref.field)
+            children.extend(val if ref.many else [val])
+        children = [i for i in children if isinstance(i, dict)]
+        if children:
+            await ref.coll._db_resolve_refs(
+                children, selection, session, prefix=f"{prefix}{ref.field}."
+            )
+
+    def _db_ref_data(self, data: dict) -> dict:
+        # loaded data is shared, so copy it before mapping MONGO_ID to id field
+        return {**data, self._db_id_field(): data[MONGO_ID]}
 
     def _db_dump_data(self, data: T) -> bson.SON:
-        son = data.model_dump(by_alias=True)
+        partial = getattr(data, "_om_partial", None)
+        son = data.model_dump(by_alias=True, include=partial)
         # map id field to MONGO_ID
         son[MONGO_ID] = son.pop(self._db_id_field())
         # map references to local field
         for ref in self.refs:
+            if partial is not None and ref.field not in partial:
+                continue
             val = son.pop(ref.field)
             if ref.many:
                 val = (
@@ -156,72 +565,270 @@ class Collection(Generic[T]):
             son[ref.local] = val
         return bson.SON(son)
 
-    def _db_save_op(self, data: list[T]) -> list[tuple]:
+    def _db_save_op(
+        self,
+        data: list[T],
+        tracked: list[tuple] | None = None,
+        cascade: Cascade = "all",
+        seen: set | None = None,
+        create: bool = False,
+        allow_partial: bool = False,
+    ) -> list[tuple]:
+        seen = set() if seen is None else seen
         ops = []
         for d in data:
+            # save each data once
+            key = (self.name, getattr(d, self.id_field))
+            if key in seen:
+                continue
+            seen.add(key)
+            partial = getattr(d, "_om_partial", None)
+            if partial is not None and not allow_partial:
+                raise PartialDataError(
+                    f"Can't save partial {self.model.__name__}, "
+                    "use allow_partial to save loaded fields"
+                )
             # references save operations
             for ref in self.refs:
+                mode = ref.cascade or cascade
+                if mode == "none" or (partial is not None and ref.field not in partial):
+                    continue
                 ref_d = getattr(d, ref.field)
                 ref_d = [ref_d] if not ref.many else ref_d
-                ref_d = [i for i in ref_d if i is not None]  # not null refs
-                ops.extend(ref.coll._db_save_op(ref_d))
+                # not null and loaded refs
+                ref_d = [i for i in ref_d if i is not None and is_loaded(i)]
+                # new or modified refs
+                if mode == "changed":
+                    ref_d = [i for i in ref_d if ref.coll._db_is_modified(i)]
+                ops.extend(
+                    ref.coll._db_save_op(
+                        ref_d, tracked, cascade, seen, allow_partial=allow_partial
+                    )
+                )
             # save operation
-            ops.append(
-                (
-                    self,
-                    ReplaceOne(
-                        {MONGO_ID: getattr(d, self.id_field)},
-                        replacement=self._db_dump_data(d),
+            son = self._db_dump_data(d)
+            snapshot = self._db_snapshot_of(d)
+            update = (
+                build_update(snapshot, son)
+                if snapshot is not None and snapshot.get(MONGO_ID) == son[MONGO_ID]
+                else None
+            )
+            # on partial data, set loaded fields only
+            if partial is not None:
+                if update is None:
+                    update = {"$set": {k: v for k, v in son.items() if k != MONGO_ID}}
+                op = (
+                    UpdateOne(
+                        {MONGO_ID: son[MONGO_ID]},
+                        update,
                         collation=self.collation,
-                        upsert=True,
-                    ),
+                    )
+                    if update
+                    else None
                 )
-            )
+            # on new data, insert it
+            elif create or self._db_is_new(d):
+                op = InsertOne(son)
+            # on unknown or not trackable changes, replace whole data
+            elif update is None:
+                op = ReplaceOne(
+                    {MONGO_ID: son[MONGO_ID]},
+                    replacement=son,
+                    collation=self.collation,
+                    upsert=True,
+                )
+            # on changes, update changed fields only
+            elif update:
+                op = UpdateOne(
+                    {MONGO_ID: son[MONGO_ID]},
+                    update,
+                    collation=self.collation,
+                )
+            else:
+                op = None
+            if op is not None:
+                ops.append((self, op))
+            if tracked is not None:
+                tracked.append((self, d, son))
         return ops
 
+    def _db_is_new(self, data: T) -> bool:
+        # not persisted data with a generated id
+        return (
+            getattr(data, "_om_persisted", True) is False
+            and self.id_field not in data.model_fields_set
+        )
+
+    def _db_saved(self, data: T, son: bson.SON):
+        # saved data is persisted and the new tracking snapshot
+        if not hasattr(data, "_om_persisted"):
+            return
+        data._om_persisted = True  # type: ignore
+        if self.track_changes:
+            data._om_snapshot = son  # type: ignore
+
+    def _db_deleted(self, data: T):
+        # deleted data is no longer persisted, next save upserts it again
+        if not hasattr(data, "_om_persisted"):
+            return
+        data._om_persisted = False  # type: ignore
+        data._om_snapshot = None  # type: ignore
+
+    def _db_snapshot_of(self, data: T) -> dict | None:
+        if not self.track_changes:
+            return None
+        return getattr(data, "_om_snapshot", None)
+
+    def _db_changes(self, data: T) -> dict | None:
+        """
+        Get the update for changes since load or last save, None when untracked
+        """
+        snapshot = self._db_snapshot_of(data)
+        if snapshot is None:
+            return None
+        return build_update(snapshot, self._db_dump_data(data))
+
+    def _db_is_modified(self, data: T) -> bool:
+        return self._db_changes(data) != {}
+
+    def _db_track(self, data: T, raw: dict):
+        """
+        Mark loaded data (and dereferenced data) as persisted, keeping its raw
+        data to track changes
+        """
+        if not hasattr(data, "_om_persisted"):
+            return
+        data._om_persisted = True  # type: ignore
+        if self.track_changes:
+            ref_fields = {ref.field for ref in self.refs}
+            snapshot = {k: v for k, v in raw.items() if k not in ref_fields}
+            id_field = self._db_id_field()
+            if id_field in snapshot:
+                snapshot[MONGO_ID] = snapshot.pop(id_field)
+            # on partial data, track loaded fields only
+            partial = getattr(data, "_om_partial", None)
+            if partial is not None:
+                keys = set(self._db_dump_data(data))
+                snapshot = {k: v for k, v in snapshot.items() if k in keys}
+            data._om_snapshot = snapshot  # type: ignore
+        # track dereferenced data
+        for ref in self.refs:
+            val, raw_val = getattr(data, ref.field, None), raw.get(ref.field)
+            if ref.many:
+                pairs = zip(val or [], raw_val or [])
+            else:
+                pairs = [(val, raw_val)]
+            for i, raw_i in pairs:
+                if isinstance(raw_i, dict) and i is not None and is_loaded(i):
+                    ref.coll._db_track(i, raw_i)
+
     async def _db_delete_op(
         self, data: list[T], session: Session | None = None
     ) -> list[tuple]:
+        rev_refs, _ = self.db.__refs__.delete_plan(self)
+        level = {
+            self: [
+                {
+                    MONGO_ID: getattr(d, self.id_field),
+                    **{field: getattr(d, ref.ref) for _, ref, field in rev_refs},
+                }
+                for d in data
+            ]
+        }
+        return await self._db_cascade_op(level, session=session)
+
+    async def _db_cascade_op(
+        self,
+        level: dict["Collection", list[dict]],
+        session: Session | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> list[tuple]:
+        """
+        Build delete operations walking reverse-references breadth-first,
+        one query per (collection, reference) and chunk of keys on each level
+        """
         ops = []
-        for d in data:
-            # reverse-references delete opterations
-            for coll, ref in get_reverse_references(self):
-                coll_d = await coll.afetch(
-                    {ref.local: getattr(d, ref.ref)},
-                    session=session,
-                )
-                # drop whole data
-                if ref.on_delete == OnDelete.CASCADE:
-                    ops.extend(await coll._db_delete_op(coll_d))
-                # set ref fied to null
-                elif ref.on_delete == OnDelete.SET_NULL:
-                    for i in coll_d:
-                        ref_f = getattr(i, ref.field)
+        deleted = defaultdict(set)
+        while level:
+            next_level = defaultdict(list)
+            for coll, coll_d in level.items():
+                coll_d = [d for d in coll_d if d[MONGO_ID] not in deleted[coll]]
+                if not coll_d:
+                    continue
+                ids = [d[MONGO_ID] for d in coll_d]
+                deleted[coll].update(ids)
+                # reverse-references delete operations
+                rev_refs, _ = coll.db.__refs__.delete_plan(coll)
+                for rev_coll, ref, field in rev_refs:
+                    keys = list({d[field] for d in coll_d if d.get(field) is not None})
+                    # bound $in lists on large fan-outs
+                    for keys in _chunked(keys, chunk_size):
+                        # drop whole data
+                        if ref.on_delete == OnDelete.CASCADE:
+                            next_level[rev_coll].extend(
+                                await rev_coll._db_delete_keys(
+                                    {ref.local: {"$in": keys}}, session=session
+                                )
+                            )
                         # on many-refs, just remove it from list
-                        if ref.many:
-                            ref_f = [
-                                j
-                                for j in ref_f
-                                if getattr(j, coll.id_field)
-                                != getattr(d, coll.id_field)
-                            ]
+                        elif ref.on_delete == OnDelete.SET_NULL and ref.many:
+                            ops.append(
+                                (
+                                    rev_coll,
+                                    UpdateMany(
+                                        {ref.local: {"$in": keys}},
+                                        {"$pull": {ref.local: {"$in": keys}}},
+                                        collation=rev_coll.collation,
+                                    ),
+                                )
+                            )
                         # on one-ref, set to null
-                        else:
-                            ref_f = None
-                        setattr(i, ref.field, ref_f)
-                    ops.extend(coll._db_save_op(coll_d))
-            # delete operation
-            ops.append(
-                (
-                    self,
-                    DeleteOne(
-                        {MONGO_ID: getattr(d, self.id_field)},
-                        collation=self.collation,
-                    ),
-                )  # type: ignore
-            )
+                        elif ref.on_delete == OnDelete.SET_NULL:
+                            ops.append(
+                                (
+                                    rev_coll,
+                                    UpdateMany(
+                                        {ref.local: {"$in": keys}},
+                                        {"$set": {ref.local: None}},
+                                        collation=rev_coll.collation,
+                                    ),
+                                )
+                            )
+                # delete operations
+                for ids in _chunked(ids, chunk_size):
+                    ops.append(
+                        (
+                            coll,
+                            DeleteMany(
+                                {MONGO_ID: {"$in": ids}},
+                                collation=coll.collation,
+                            ),
+                        )
+                    )
+            level = next_level
         return ops
 
+    async def _db_delete_keys(
+        self,
+        filter: dict,
+        session: Session | None = None,
+        limit: int = -1,
+        by_refs: bool = False,
+    ) -> list[dict]:
+        # get MONGO_ID and fields referenced by reverse-references
+        _, project = self.db.__refs__.delete_plan(self)
+        # on filters by references, match dereferenced data
+        if by_refs:
+            stages = build_fetch_pipeline(
+                self, filter, limit=limit, dereference="batch"
+            )
+        else:
+            stages = [{"$match": filter}, *([{"$limit": limit}] if limit > 0 else [])]
+        return await self.aggregate(
+            [*stages, {"$project": project}],
+            session=session,
+        ).alist()
+
     def aggregate(
         self,
         pipeline: list[dict],
@@ -244,17 +851,38 @@ class Collection(Generic[T]):
         limit: int = -1,
         session: Session | None = None,
         cursor_options: dict = {},
+        include: list[str] | None = None,
+        exclude_refs: list[str] = [],
+        dereference: Dereference | None = None,
+        batch_size: int = PAGE_SIZE,
+        read_mode: ReadMode | None = None,
+        projection: list[str] | Type[pydantic.BaseModel] | Projection | None = None,
     ) -> Cursor[T]:
-        pipeline = build_dereference_pipeline(self.refs)
-        if filter:
-            pipeline.append({"$match": filter})
-        if sort:
-            pipeline.append({"$sort": sort})
-        if skip > 0:
-            pipeline.append({"$skip": skip})  # type: ignore
-        if limit > 0:
-            pipeline.append({"$limit": limit})  # type: ignore
-        return Cursor(self, pipeline=pipeline, session=session, **cursor_options)
+        dereference = dereference or self.dereference
+        selection = self._db_selection(include, exclude_refs)
+        if projection is not None and not isinstance(projection, Projection):
+            projection = Projection(projection)
+        pipeline = build_fetch_pipeline(
+            self,
+            filter=filter,
+            sort=sort,
+            skip=skip,
+            limit=limit,
+            selection=selection,
+            dereference=dereference,
+            projection=projection,
+        )
+        return Cursor(
+            self,
+            pipeline=pipeline,
+            session=session,
+            selection=selection,
+            resolve_refs=dereference == "batch",
+            batch_size=batch_size,
+            read_mode=read_mode or self.read_mode,
+            projection=projection,
+            **cursor_options,
+        )
 
     async def afetch_one(
         self,
@@ -262,27 +890,588 @@ class Collection(Generic[T]):
         sort: dict = {},
         session: Session | None = None,
         cursor_options: dict = {},
+        include: list[str] | None = None,
+        exclude_refs: list[str] = [],
+        dereference: Dereference | None = None,
+        read_mode: ReadMode | None = None,
+        projection: list[str] | Type[pydantic.BaseModel] | None = None,
     ) -> T | None:
+        # serve primary-key lookups from cache
+        key = self._db_pk(filter) if self.cache is not None and not session else None
+        if key is not None:
+            selection = self._db_selection(include, exclude_refs)
+            data = (await self._db_load(MONGO_ID, [key])).get(key)
+            if data is None:
+                return None
+            data = {**data}
+            await self._db_resolve_refs([data], selection)
+            return self._db_parse_data(
+                data,
+                selection,
+                read_mode or self.read_mode,
+                Projection(projection) if projection is not None else None,
+            )
         data = await self.fetch(
             filter,
             sort=sort,
             limit=1,
             session=session,
             cursor_options=cursor_options,
+            include=include,
+            exclude_refs=exclude_refs,
+            dereference=dereference,
+            read_mode=read_mode,
+            projection=projection,
         ).alist()
         if data:
             return data[0]
         return None
 
-    async def asave(self, data: T | list[T], session: Session | None = None):
+    async def apage(
+        self,
+        filter: dict = {},
+        sort: dict = {},
+        limit: int = 20,
+        after: str | None = None,
+        before: str | None = None,
+        session: Session | None = None,
+        include: list[str] | None = None,
+        exclude_refs: list[str] = [],
+        dereference: Dereference | None = None,
+        read_mode: ReadMode | None = None,
+        projection: list[str] | Type[pydantic.BaseModel] | None = None,
+    ) -> Page[T]:
+        """
+        Get a page of data by keyset (seek) pagination, after or before the
+        data of a page token
+        """
+        # sort by MONGO_ID to break ties
+        sort = self._db_sort(sort)
+        sort = Sort({**sort, MONGO_ID: sort.get(MONGO_ID, 1)})
+        # seek backwards on reversed sort
+        seek_sort = reverse_sort(sort) if before is not None else sort
+        token = before if before is not None else after
+        query = Query(filter)
+        if token is not None:
+            query = query & build_keyset_query(
+                seek_sort,
+                decode_token(
+                    token, len(sort), self.codec_options or DEFAULT_CODEC_OPTIONS
+                ),
+            )
+        # keep sort fields on projected data
+        if projection is not None:
+            projection = Projection(projection).extending(sort)
+        data = await self.fetch(
+            query,
+            sort=seek_sort,
+            limit=limit + 1,
+            session=session,
+            include=include,
+            exclude_refs=exclude_refs,
+            dereference=dereference,
+            batch_size=limit + 1,
+            read_mode="raw",
+            projection=projection,
+        ).alist()
+        more = len(data) > limit
+        data = data[:limit]
+        if before is not None:
+            data.reverse()
+        first, last = (
+            [
+                encode_token(
+                    self._db_key_values(d, sort),
+                    self.codec_options or DEFAULT_CODEC_OPTIONS,
+                )
+                for d in (data[0], data[-1])
+            ]
+            if data
+            else [None, None]
+        )
+        if before is not None:
+            next_token, prev_token = last, first if more else None
+        else:
+            next_token = last if more else None
+            prev_token = first if after is not None else None
+        # parse raw data
+        read_mode = read_mode or self.read_mode
+        if read_mode != "raw":
+            data = self._db_parse_many(
+                data,
+                self._db_selection(include, exclude_refs),
+                read_mode,
+                projection,
+            )
+        return Page(data, next=next_token, prev=prev_token)
+
+    def _db_key_values(self, data: dict, sort: dict) -> list:
+        # sort key values of raw data (MONGO_ID mapped to id field)
+        values = []
+        for path in sort:
+            val = data
+            for token in path.split("."):
+                if val is data and token == MONGO_ID:
+                    token = self._db_id_field()
+                val = val.get(token) if isinstance(val, dict) else None
+            values.append(val)
+        return values
+
+    async def acount(
+        self,
+        filter: dict = {},
+        skip: int = 0,
+        limit: int = -1,
+        session: Session | None = None,
+    ) -> int:
+        # dereference only when filtering by references
+        if query_refs(self, filter):
+            data = await self.aggregate(
+                [
+                    *build_fetch_pipeline(
+                        self, filter, skip=skip, limit=limit, dereference="batch"
+                    ),
+                    {"$count": "count"},
+                ],
+                session=session,
+            ).alist()
+            return data[0]["count"] if data else 0
+        options = {}
+        if skip > 0:
+            options["skip"] = skip
+        if limit > 0:
+            options["limit"] = limit
+        c = await self._db_coll(session)
+        return await c.count_documents(
+            self._db_query(filter),
+            session=session._sess if session else None,
+            **options,
+        )
+
+    async def aexists(self, filter: dict = {}, session: Session | None = None) -> bool:
+        return await self.acount(filter, limit=1, session=session) > 0
+
+    async def adistinct(
+        self,
+        field: str,
+        filter: dict = {},
+        session: Session | None = None,
+    ) -> list:
+        field = self._db_query_field(field)
+        # dereference only when filtering by (or getting) references fields
+        if query_refs(self, filter) or field_refs(self.refs, field):
+            # $unwind doesn't walk through arrays, unwind each (many-ref) prefix
+            paths = dict.fromkeys([*field_refs(self.refs, field), field])
+            data = await self.aggregate(
+                [
+                    *build_fetch_pipeline(
+                        self,
+                        {"$and": [filter, {field: {"$exists": True}}]},
+                        dereference="batch",
+                    ),
+                    *({"$unwind": f"${p}"} for p in paths),
+                    {"$group": {MONGO_ID: f"${field}"}},
+                ],
+                session=session,
+            ).alist()
+            return [d[MONGO_ID] for d in data]
+        c = await self._db_coll(session)
+        return await c.distinct(
+            field,
+            self._db_query(filter),
+            session=session._sess if session else None,
+        )
+
+    async def aestimated_count(self) -> int:
+        c = await self._db_coll()
+        return await c.estimated_document_count()
+
+    async def _db_write_filter(
+        self,
+        filter: dict,
+        limit: int = -1,
+        session: Session | None = None,
+    ) -> dict:
+        # on filters by references, match ids of dereferenced data
+        if not query_refs(self, filter):
+            return self._db_query(filter)
+        ids = await self._db_match_ids(filter, limit=limit, session=session)
+        return {MONGO_ID: {"$in": ids}}
+
+    async def _db_match_ids(
+        self,
+        filter: dict,
+        sort: dict = {},
+        limit: int = -1,
+        session: Session | None = None,
+    ) -> list:
+        # MONGO_IDs of data matched by a (references) filter
+        data = await self.aggregate(
+            [
+                *build_fetch_pipeline(
+                    self, filter, sort=sort, limit=limit, dereference="batch"
+                ),
+                {"$project": {MONGO_ID: 1}},
+            ],
+            session=session,
+        ).alist()
+        return [d[MONGO_ID] for d in data]
+
+    def _db_update(self, update: dict) -> dict:
+        """
+        Map update fields to stored fields, reference fields to local fields
+        """
+        refs = {ref.field: ref for ref in self.refs}
+        db_update = {}
+        for op, fields in update.items():
+            db_update[op] = {}
+            for path, val in fields.items():
+                field, _, sub = path.partition(".")
+                ref = refs.get(field)
+                if ref is not None:
+                    field, val = ref.local, _ref_key(ref, val)
+                elif field in self.model.model_fields:
+                    field = self._db_key_field(field)
+                db_update[op][f"{field}.{sub}" if sub else field] = _dump_value(val)
+        return db_update
+
+    async def aupdate_one(
+        self,
+        filter: dict,
+        update: dict,
+        session: Session | None = None,
+        upsert: bool = False,
+    ) -> BulkResult:
+        op = UpdateOne(
+            await self._db_write_filter(filter, limit=1, session=session),
+            self._db_update(update),
+            collation=self.collation,
+            upsert=upsert,
+        )
+        return await self.db._apply([(self, op)], session=session)
+
+    async def aupdate_many(
+        self,
+        filter: dict,
+        update: dict,
+        session: Session | None = None,
+        upsert: bool = False,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> BulkResult:
+        update = self._db_update(update)
+        if not query_refs(self, filter):
+            op = UpdateMany(
+                self._db_query(filter),
+                update,
+                collation=self.collation,
+                upsert=upsert,
+            )
+            return await self.db._apply([(self, op)], session=session)
+        # on filters by references, update by chunks of matching MONGO_IDs
+        result = BulkResult()
+        last = None
+        while True:
+            q = (
+                filter
+                if last is None
+                else {"$and": [filter, {MONGO_ID: {"$gt": last}}]}
+            )
+            ids = await self._db_match_ids(
+                q, sort={MONGO_ID: 1}, limit=chunk_size, session=session
+            )
+            # nothing matched, upsert as a single update
+            if not ids and last is None and upsert:
+                op = UpdateMany({MONGO_ID: {"$in": []}}, update, upsert=True)
+                return await self.db._apply([(self, op)], session=session)
+            if not ids:
+                return result
+            op = UpdateMany({MONGO_ID: {"$in": ids}}, update, collation=self.collation)
+            result.merge(await self.db._apply([(self, op)], session=session))
+            last = ids[-1]
+
+    async def afind_one_and_update(
+        self,
+        filter: dict,
+        update: dict,
+        sort: dict = {},
+        session: Session | None = None,
+        upsert: bool = False,
+        return_new: bool = True,
+    ) -> T | None:
+        c = await self._db_coll(session)
+        data = await c.find_one_and_update(
+            await self._db_write_filter(filter, session=session),
+            self._db_update(update),
+            sort=list(self._db_sort(sort).items()) or None,
+            upsert=upsert,
+            return_document=(
+                ReturnDocument.AFTER if return_new else ReturnDocument.BEFORE
+            ),
+            collation=self.collation,
+            session=session._sess if session else None,
+        )
+        if data is None:
+            return None
+        if self.cache is not None:
+            self.cache.invalidate(data[MONGO_ID])
+        await self._db_resolve_refs([data], session=session)
+        return self._db_parse_data(data)
+
+    async def aload_refs(
+        self,
+        data: T | list[T],
+        paths: list[str],
+        session: Session | None = None,
+    ):
+        """
+        Load unloaded references, one batched query per reference path
+        """
         data = [data] if not isinstance(data, list) else data
-        ops = self._db_save_op(data)
-        await self.db._apply(ops, session=session)
+        # load parents before children
+        for path in sorted(paths, key=lambda p: p.count(".")):
+            owners = [(self, d) for d in data]
+            tokens = path.split(".")
+            for token in tokens[:-1]:
+                owners = [
+                    (ref.coll, i)
+                    for coll, d in owners
+                    for ref in coll.refs
+                    if ref.field == token
+                    for i in _ref_values(ref, d)
+                    if is_loaded(i)
+                ]
+            # group unloaded values by reference
+            groups = defaultdict(list)
+            for coll, d in owners:
+                for ref in coll.refs:
+                    if ref.field == tokens[-1]:
+                        groups[ref].append(d)
+            for ref, owners_d in groups.items():
+                keys = {
+                    getattr(i, ref.ref)
+                    for d in owners_d
+                    for i in _ref_values(ref, d)
+                    if not is_loaded(i)
+                }
+                if not keys:
+                    continue
+                loaded = await ref.coll.fetch(
+                    {ref.coll._db_field(ref.ref): {"$in": list(keys)}},
+                    session=session,
+                    include=[],
+                ).alist()
+                loaded = {getattr(i, ref.ref): i for i in loaded}
+                # replace unloaded values
+                for d in owners_d:
+                    val = getattr(d, ref.field)
+                    if ref.many:
+                        val = [
+                            i if is_loaded(i) else loaded.get(getattr(i, ref.ref))
+                            for i in val
+                        ]
+                        val = [i for i in val if i is not None]
+                    elif val is not None and not is_loaded(val):
+                        val = loaded.get(getattr(val, ref.ref))
+                    setattr(d, ref.field, val)
+
+    async def asave(
+        self,
+        data: T | list[T],
+        session: Session | None = None,
+        cascade: Cascade = "all",
+        ordered: bool = True,
+        allow_partial: bool = False,
+    ) -> BulkResult:
+        data = [data] if not isinstance(data, list) else data
+        tracked = []
+        ops = self._db_save_op(
+            data, tracked, cascade=cascade, allow_partial=allow_partial
+        )
+        try:
+            result = await self.db._apply(ops, session=session, ordered=ordered)
+        except BulkWriteError as e:
+            _saved_inserts(ops, tracked, e.result)
+            raise
+        for coll, d, son in tracked:
+            coll._db_saved(d, son)
+        return result
+
+    async def acreate_many(
+        self,
+        data: list[T | dict],
+        session: Session | None = None,
+        cascade: Cascade = "all",
+        ordered: bool = False,
+    ) -> list[T]:
+        """
+        Insert new data (models or dicts), references are saved as usual
+        """
+        data = [
+            d if isinstance(d, self.model) else self.model.model_validate(d)
+            for d in data
+        ]
+        tracked = []
+        ops = self._db_save_op(data, tracked, cascade=cascade, create=True)
+        try:
+            await self.db._apply(ops, session=session, ordered=ordered)
+        except BulkWriteError as e:
+            _saved_inserts(ops, tracked, e.result)
+            raise
+        for coll, d, son in tracked:
+            coll._db_saved(d, son)
+        return data
+
+    async def asave_stream(
+        self,
+        data: AsyncIterable[T | dict] | Iterable[T | dict],
+        session: Session | None = None,
+        cascade: Cascade = "all",
+        ordered: bool = True,
+        batch_size: int = 1000,
+        concurrency: int = 4,
+        on_progress: Callable[[int, BulkResult], Any] | None = None,
+    ) -> BulkResult:
+        """
+        Save a stream of data (models or dicts) in pipelined batches, with at
+        most `concurrency` batches in flight
+        """
+        result = BulkResult()
+        # sessions can't be shared by concurrent operations
+        sem = asyncio.Semaphore(concurrency if session is None else 1)
+        flushes = set()
+        errors: list[Exception] = []
+        saved = 0
+
+        async def _flush(batch: list[T]):
+            nonlocal saved
+            try:
+                tracked = []
+                ops = self._db_save_op(batch, tracked, cascade=cascade)
+                try:
+                    result.merge(
+                        await self.db._apply(ops, session=session, ordered=ordered)
+                    )
+                except BulkWriteError as e:
+                    _saved_inserts(ops, tracked, e.result)
+                    result.merge(e.result)
+                    return
+                for coll, d, son in tracked:
+                    coll._db_saved(d, son)
+                saved += len(batch)
+                if on_progress is not None:
+                    on_progress(saved, result)
+            except Exception as e:
+                # keep the error, finished tasks are discarded
+                errors.append(e)
+            finally:
+                sem.release()
+
+        async def _submit(batch: list[T]):
+            # wait for a free slot (backpressure)
+            await sem.acquire()
+            if errors:
+                sem.release()
+                return
+            task = asyncio.ensure_future(_flush(batch))
+            flushes.add(task)
+            task.add_done_callback(flushes.discard)
+
+        try:
+            batch = []
+            async for d in _aiter(data):
+                if not isinstance(d, self.model):
+                    d = self.model.model_validate(d)
+                batch.append(d)
+                if len(batch) >= batch_size:
+                    await _submit(batch)
+                    batch = []
+                # stop submitting batches on first error
+                if errors:
+                    break
+            if batch and not errors:
+                await _submit(batch)
+            await asyncio.gather(*flushes)
+        except BaseException:
+            for task in flushes:
+                task.cancel()
+            raise
+        if errors:
+            raise errors[0]
+        if not result.ok:
+            raise BulkWriteError(result)
+        return result
 
-    async def adelete(self, data: T | list[T], session: Session | None = None):
+    async def adelete(
+        self,
+        data: T | list[T],
+        session: Session | None = None,
+        ordered: bool = True,
+    ) -> BulkResult:
         data = [data] if not isinstance(data, list) else data
-        ops = await self._db_delete_op(data)
-        await self.db._apply(ops, session=session)
+        ops = await self._db_delete_op(data, session=session)
+        result = await self.db._apply(ops, session=session, ordered=ordered)
+        for d in data:
+            self._db_deleted(d)
+        return result
+
+    async def adelete_many(
+        self,
+        filter: dict = {},
+        session: Session | None = None,
+        ordered: bool = True,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> BulkResult:
+        """
+        Delete data by filter without loading it, cascading on chunks of
+        (projected) deleted data
+        """
+        by_refs = bool(query_refs(self, filter))
+        if not by_refs:
+            filter = self._db_query(filter)
+        result = BulkResult()
+        # delete (and cascade) by chunks of MONGO_IDs, deleted data doesn't
+        # match again
+        while True:
+            chunk = await self._db_delete_keys(
+                filter, session=session, limit=chunk_size, by_refs=by_refs
+            )
+            if not chunk:
+                return result
+            ops = await self._db_cascade_op(
+                {self: chunk}, session=session, chunk_size=chunk_size
+            )
+            result.merge(await self.db._apply(ops, session=session, ordered=ordered))
+
+    async def async_indexes(
+        self,
+        drop: bool = False,
+        dry_run: bool = False,
+        session: Session | None = None,
+    ) -> IndexPlan:
+        """
+        Reconcile declared and existing indexes, building one index at a time
+        (dropping not declared ones only when `drop`)
+        """
+        # don't bootstrap (create) the collection on dry runs, missing
+        # collections have no indexes
+        if dry_run and self.__coll__ is None:
+            c = self.db._db.get_collection(self.name)
+        else:
+            c = await self._db_coll(session)
+        sess = session._sess if session else None
+        existing = await c.list_indexes(session=sess).to_list(None)
+        plan = build_index_plan(self.name, self.indexes, existing)
+        if dry_run:
+            return plan
+        for info, model in plan.rebuild:
+            await c.drop_index(info["name"], session=sess)
+            await c.create_indexes([model], session=sess)
+        for model in plan.create:
+            await c.create_indexes([model], session=sess)
+        if drop:
+            for info in plan.drop:
+                await c.drop_index(info["name"], session=sess)
+        return plan
 
     def fetch_one(
         self,
@@ -290,6 +1479,11 @@ class Collection(Generic[T]):
         sort: dict = {},
         session: Session | None = None,
         cursor_options: dict = {},
+        include: list[str] | None = None,
+        exclude_refs: list[str] = [],
+        dereference: Dereference | None = None,
+        read_mode: ReadMode | None = None,
+        projection: list[str] | Type[pydantic.BaseModel] | None = None,
     ) -> T | None:
         return sync.run(
             self.afetch_one(
@@ -297,11 +1491,277 @@ class Collection(Generic[T]):
                 sort=sort,
                 session=session,
                 cursor_options=cursor_options,
+                include=include,
+                exclude_refs=exclude_refs,
+                dereference=dereference,
+                read_mode=read_mode,
+                projection=projection,
+            )
+        )
+
+    def page(
+        self,
+        filter: dict = {},
+        sort: dict = {},
+        limit: int = 20,
+        after: str | None = None,
+        before: str | None = None,
+        session: Session | None = None,
+        include: list[str] | None = None,
+        exclude_refs: list[str] = [],
+        dereference: Dereference | None = None,
+        read_mode: ReadMode | None = None,
+        projection: list[str] | Type[pydantic.BaseModel] | None = None,
+    ) -> Page[T]:
+        return sync.run(
+            self.apage(
+                filter,
+                sort=sort,
+                limit=limit,
+                after=after,
+                before=before,
+                session=session,
+                include=include,
+                exclude_refs=exclude_refs,
+                dereference=dereference,
+                read_mode=read_mode,
+                projection=projection,
             )
         )
 
-    def save(self, data: T | list[T], session: Session | None = None):
-        sync.run(self.asave(data, session=session))
+    def count(
+        self,
+        filter: dict = {},
+        skip: int = 0,
+        limit: int = -1,
+        session: Session | None = None,
+    ) -> int:
+        return sync.run(self.acount(filter, skip=skip, limit=limit, session=session))
+
+    def exists(self, filter: dict = {}, session: Session | None = None) -> bool:
+        return sync.run(self.aexists(filter, session=session))
+
+    def distinct(
+        self,
+        field: str,
+        filter: dict = {},
+        session: Session | None = None,
+    ) -> list:
+        return sync.run(self.adistinct(field, filter, session=session))
+
+    def estimated_count(self) -> int:
+        return sync.run(self.aestimated_count())
+
+    def update_one(
+        self,
+        filter: dict,
+        update: dict,
+        session: Session | None = None,
+        upsert: bool = False,
+    ) -> BulkResult:
+        return sync.run(
+            self.aupdate_one(filter, update, session=session, upsert=upsert)
+        )
+
+    def update_many(
+        self,
+        filter: dict,
+        update: dict,
+        session: Session | None = None,
+        upsert: bool = False,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> BulkResult:
+        return sync.run(
+            self.aupdate_many(
+                filter, update, session=session, upsert=upsert, chunk_size=chunk_size
+            )
+        )
+
+    def find_one_and_update(
+        self,
+        filter: dict,
+        update: dict,
+        sort: dict = {},
+        session: Session | None = None,
+        upsert: bool = False,
+        return_new: bool = True,
+    ) -> T | None:
+        return sync.run(
+            self.afind_one_and_update(
+                filter,
+                update,
+                sort=sort,
+                session=session,
+                upsert=upsert,
+                return_new=return_new,
+            )
+        )
+
+    def load_refs(
+        self,
+        data: T | list[T],
+        paths: list[str],
+        session: Session | None = None,
+    ):
+        sync.run(self.aload_refs(data, paths, session=session))
+
+    def save(
+        self,
+        data: T | list[T],
+        session: Session | None = None,
+        cascade: Cascade = "all",
+        ordered: bool = True,
+        allow_partial: bool = False,
+    ) -> BulkResult:
+        return sync.run(
+            self.asave(
+                data,
+                session=session,
+                cascade=cascade,
+                ordered=ordered,
+                allow_partial=allow_partial,
+            )
+        )
+
+    def create_many(
+        self,
+        data: list[T | dict],
+        session: Session | None = None,
+        cascade: Cascade = "all",
+        ordered: bool = False,
+    ) -> list[T]:
+        return sync.run(
+            self.acreate_many(data, session=session, cascade=cascade, ordered=ordered)
+        )
+
+    def save_stream(
+        self,
+        data: Iterable[T | dict],
+        session: Session | None = None,
+        cascade: Cascade = "all",
+        ordered: bool = True,
+        batch_size: int = 1000,
+        concurrency: int = 4,
+        on_progress: Callable[[int, BulkResult], Any] | None = None,
+    ) -> BulkResult:
+        return sync.run(
+            self.asave_stream(
+                data,
+                session=session,
+                cascade=cascade,
+                ordered=ordered,
+                batch_size=batch_size,
+                concurrency=concurrency,
+                on_progress=on_progress,
+            )
+        )
+
+    def delete(
+        self,
+        data: T | list[T],
+        session: Session | None = None,
+        ordered: bool = True,
+    ) -> BulkResult:
+        return sync.run(self.adelete(data, session=session, ordered=ordered))
+
+    def delete_many(
+        self,
+        filter: dict = {},
+        session: Session | None = None,
+        ordered: bool = True,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> BulkResult:
+        return sync.run(
+            self.adelete_many(
+                filter, session=session, ordered=ordered, chunk_size=chunk_size
+            )
+        )
+
+    def sync_indexes(
+        self,
+        drop: bool = False,
+        dry_run: bool = False,
+        session: Session | None = None,
+    ) -> IndexPlan:
+        return sync.run(self.async_indexes(drop=drop, dry_run=dry_run, session=session))
+
+
+def _construct_fields(model: Type[pydantic.BaseModel], values: dict, skip=()):
+    # construct (not validated) embedded sub-models
+    for name, field in model.model_fields.items():
+        sub = _sub_model(field.annotation)
+        if sub is None or name in skip:
+            continue
+        key = field.alias if field.alias in values else name
+        val = values.get(key)
+        if isinstance(val, dict):
+            values[key] = _construct(sub, val)
+        elif isinstance(val, list):
+            values[key] = [
+                _construct(sub, i) if isinstance(i, dict) else i for i in val
+            ]
+
+
+def _construct(model: Type[pydantic.BaseModel], data: dict) -> pydantic.BaseModel:
+    values = {**data}
+    _construct_fields(model, values)
+    return model.model_construct(**values)
+
+
+def _chunked(values: list, size: int) -> list[list]:
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
+
+def _saved_inserts(ops: list[tuple], tracked: list[tuple], result: BulkResult):
+    # mark data inserted by a failed write as saved, so retries don't insert
+    # it again (inserts are unordered, only failed ones weren't applied)
+    colls_ops = defaultdict(list)
+    for coll, op in ops:
+        colls_ops[coll].append(op)
+    inserted = set()
+    for chunk in result.chunks:
+        failed = set(chunk.failed)
+        for i in chunk.indexes:
+            op = colls_ops[chunk.coll][i]
+            if i not in failed and isinstance(op, InsertOne):
+                inserted.add((chunk.coll.name, op._doc[MONGO_ID]))
+    for coll, d, son in tracked:
+        if (coll.name, son[MONGO_ID]) in inserted:
+            coll._db_saved(d, son)
+
+
+def _ref_key(ref: Ref, val):
+    # key of referenced models
+    if isinstance(val, pydantic.BaseModel):
+        return getattr(val, ref.ref)
+    if isinstance(val, list):
+        return [_ref_key(ref, i) for i in val]
+    if isinstance(val, dict):
+        return {k: _ref_key(ref, i) for k, i in val.items()}
+    return val
+
+
+def _dump_value(val):
+    if isinstance(val, pydantic.BaseModel):
+        return val.model_dump(by_alias=True)
+    if isinstance(val, list):
+        return [_dump_value(i) for i in val]
+    if isinstance(val, dict):
+        return {k: _dump_value(i) for k, i in val.items()}
+    return val
+
+
+def _ref_values(ref: Ref, data) -> list:
+    val = getattr(data, ref.field)
+    if ref.many:
+        return val or []
+    return [val] if val is not None else []
+
 
-    def delete(self, data: T | list[T], session: Session | None = None):
-        sync.run(self.adelete(data, session=session))
+async def _aiter(data: AsyncIterable | Iterable):
+    if isinstance(data, AsyncIterable):
+        async for i in data:
+            yield i
+    else:
+        for i in data:
+            yield i
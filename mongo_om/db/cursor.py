@@ -1,12 +1,27 @@
-from typing import TYPE_CHECKING, Generic
+import copy
+import time
+import warnings
+from collections import deque
+from typing import TYPE_CHECKING, AsyncIterator, Generic, Iterator, Literal
 
 from mongo_om import sync
+from mongo_om.db.explain import ExplainSummary, parse_explain
+from mongo_om.db.projection import Projection
+from mongo_om.db.references import RefSelection
 from mongo_om.db.session import Session
+from mongo_om.errors import CollectionScanError, CollectionScanWarning
 from mongo_om.types import T
 
 if TYPE_CHECKING:
     from .collection import Collection
 
+# default documents per server batch (and parsed page)
+PAGE_SIZE = 100
+
+ReadMode = Literal["validate", "construct", "raw"]
+
+Verbosity = Literal["queryPlanner", "executionStats", "allPlansExecution"]
+
 
 class Cursor(Generic[T]):
 
@@ -16,6 +31,11 @@ class Cursor(Generic[T]):
         pipeline: list[dict],
         session: Session | None = None,
         parse_db_data: bool = True,
+        selection: RefSelection | None = None,
+        resolve_refs: bool = False,
+        batch_size: int = PAGE_SIZE,
+        read_mode: ReadMode = "validate",
+        projection: Projection | None = None,
         **options,
     ):
         self.__cursor__ = None
@@ -23,18 +43,132 @@ class Cursor(Generic[T]):
         self._pipeline = pipeline
         self._session = session
         self._parse_db_data = parse_db_data
+        self._selection = selection
+        self._resolve_refs = resolve_refs
+        self.batch_size = batch_size
+        self.read_mode = read_mode
+        self._projection = projection
         self._options = options
+        self._buffer = deque()
 
     async def __init_db_cursor__(self):
         coll = await self.coll._db_coll(self._session)
         self.__cursor__ = coll.aggregate(
             self._pipeline,
             session=self._session._sess if self._session else None,
-            **self._options,
+            **{"batchSize": self.batch_size, **self._options},
         )  # type: ignore
 
+    @property
+    def pipeline(self) -> list[dict]:
+        """
+        Get (a copy of) the aggregate pipeline run by the cursor
+        """
+        return copy.deepcopy(self._pipeline)
+
+    async def aexplain(
+        self,
+        verbosity: Verbosity = "executionStats",
+        on_scan: Literal["ignore", "warn", "raise"] = "ignore",
+    ) -> ExplainSummary:
+        """
+        Explain the aggregate pipeline of the cursor, warning or raising
+        (`on_scan`) when it scans any collection
+        """
+        coll = await self.coll._db_coll(self._session)
+        options = {
+            k: v.document if hasattr(v, "document") else v
+            for k, v in self._options.items()
+        }
+        explain = await coll.database.command(
+            {
+                "explain": {
+                    "aggregate": coll.name,
+                    "pipeline": self._pipeline,
+                    "cursor": {},
+                    **options,
+                },
+                "verbosity": verbosity,
+            },
+            session=self._session._sess if self._session else None,
+        )
+        summary = parse_explain(coll.name, explain, verbosity)
+        if summary.collscan and on_scan == "raise":
+            raise CollectionScanError(summary)
+        if summary.collscan and on_scan == "warn":
+            warnings.warn(
+                f"Query scans collections: {', '.join(summary.scans)}",
+                CollectionScanWarning,
+                stacklevel=2,
+            )
+        return summary
+
+    def explain(
+        self,
+        verbosity: Verbosity = "executionStats",
+        on_scan: Literal["ignore", "warn", "raise"] = "ignore",
+    ) -> ExplainSummary:
+        return sync.run(self.aexplain(verbosity=verbosity, on_scan=on_scan))
+
+    async def _anext_page(self, length: int) -> list:
+        """
+        Get next page of (at most `length`) data, dereferenced and parsed
+        as a whole
+        """
+        first = self.__cursor__ is None
+        start = time.perf_counter()
+        if first:
+            await self.__init_db_cursor__()
+        page = await self.__cursor__.to_list(length=length)  # type: ignore
+        # record query shapes on first page (query open + first batch)
+        advisor = self.coll.db.__advisor__
+        if first and advisor is not None:
+            advisor.record(
+                self.coll,
+                self._pipeline,
+                time.perf_counter() - start,
+                explain=self._session is None,
+            )
+        if not page:
+            return page
+        if self._resolve_refs:
+            await self.coll._db_resolve_refs(
+                page, self._selection, session=self._session
+            )
+        if self._parse_db_data:
+            page = self.coll._db_parse_many(
+                page, self._selection, self.read_mode, self._projection
+            )
+        return page
+
+    async def batches(self, n: int | None = None) -> AsyncIterator[list[T]]:
+        """
+        Iterate over lists of (at most `n`) data
+        """
+        n = n or self.batch_size
+        while True:
+            batch = []
+            while self._buffer and len(batch) < n:
+                batch.append(self._buffer.popleft())
+            if len(batch) < n:
+                batch.extend(await self._anext_page(n - len(batch)))
+            if not batch:
+                return
+            yield batch
+
+    def iter_batches(self, n: int | None = None) -> Iterator[list[T]]:
+        batches = self.batches(n)
+        while True:
+            try:
+                yield sync.run(anext(batches))
+            except StopAsyncIteration:
+                return
+
     async def alist(self) -> list[T]:
-        return [i async for i in self]
+        data = []
+        async for batch in self.batches():
+            data.extend(batch)
+        return data
 
     def list(self) -> list[T]:
         return sync.run(self.alist())
@@ -46,12 +180,19 @@ class Cursor(Generic[T]):
         return self
 
     async def __anext__(self):
-        if self.__cursor__ is None:
-            await self.__init_db_cursor__()
-        data = await anext(self.__cursor__)
-        if self._parse_db_data:
-            data = self.coll._db_parse_data(data)
-        return data
+        # iterate page by page
+        if not self._buffer:
+            page = await self._anext_page(self.batch_size)
+            if not page:
+                raise StopAsyncIteration
+            self._buffer.extend(page)
+        return self._buffer.popleft()
 
     def __next__(self):
-        return sync.run(self.__anext__())
+        # prefetch whole pages on each loop crossing
+        if not self._buffer:
+            page = sync.run(self._anext_page(self.batch_size))
+            if not page:
+                raise StopIteration
+            self._buffer.extend(page)
+        return self._buffer.popleft()
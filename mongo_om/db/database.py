@@ -11,10 +11,17 @@ from pymongo.read_concern import ReadConcern
 from pymongo.read_preferences import _ServerMode
 
 from mongo_om import sync
+from mongo_om.db.advisor import IndexAdvisor
+from mongo_om.db.bulk import CHUNK_MAX_BYTES, CHUNK_SIZE, BulkResult, BulkWriter
+from mongo_om.db.cache import CachePolicy
 from mongo_om.db.collection import Collection as Coll
-from mongo_om.db.references import Ref
+from mongo_om.db.cursor import ReadMode
+from mongo_om.db.graph import RefGraph
+from mongo_om.db.reconcile import IndexPlan
+from mongo_om.db.references import Dereference, Ref
 from mongo_om.db.session import Session
-from mongo_om.errors import DatabaseError
+from mongo_om.db.watcher import Watcher
+from mongo_om.errors import BulkWriteError, DatabaseError
 from mongo_om.types import T
 
 __all__ = ("Database",)
@@ -30,15 +37,26 @@ class Database:
         read_preference: _ServerMode | None = None,
         write_concern: WriteConcern | None = None,
         read_concern: ReadConcern | None = None,
+        bulk_chunk_size: int = CHUNK_SIZE,
+        bulk_max_bytes: int = CHUNK_MAX_BYTES,
+        bulk_concurrency: int = 4,
     ):
         self.__db__ = None
         self.__colls__ = {}  # type: ignore
+        self.__refs__ = RefGraph()
+        self.__watcher__ = None
+        self.__advisor__: IndexAdvisor | None = None
         self.name = name
         self.collation = collation
         self.codec_options = codec_options
         self.read_preference = read_preference
         self.write_concern = write_concern
         self.read_concern = read_concern
+        self.bulk_writer = BulkWriter(
+            chunk_size=bulk_chunk_size,
+            max_bytes=bulk_max_bytes,
+            concurrency=bulk_concurrency,
+        )
 
     @property
     def _db(self) -> AsyncIOMotorDatabase:
@@ -73,7 +91,8 @@ class Database:
         self,
         ops: list[tuple],
         session: Session | None = None,
-    ):
+        ordered: bool = True,
+    ) -> BulkResult:
         """
         Apply operations into database
         """
@@ -82,23 +101,72 @@ class Database:
         for coll, op in ops:
             colls_ops[coll].append(op)
         # apply ops by collection
-        coros = []
-        for coll, op in colls_ops.items():
-            coros.append(self._coll_apply(coll, op, session=session))
-        await asyncio.gather(*coros)
+        result = BulkResult()
+        if session is not None:
+            for coll, op in colls_ops.items():
+                result.merge(await self._coll_apply(coll, op, session, ordered))
+        else:
+            coros = []
+            for coll, op in colls_ops.items():
+                coros.append(self._coll_apply(coll, op, ordered=ordered))
+            for res in await asyncio.gather(*coros):
+                result.merge(res)
+        if not result.ok:
+            raise BulkWriteError(result)
+        return result
 
-    async def _coll_apply(self, coll: Coll, ops: list, session: Session | None = None):
+    async def _coll_apply(
+        self,
+        coll: Coll,
+        ops: list,
+        session: Session | None = None,
+        ordered: bool = True,
+    ) -> BulkResult:
         """
         Apply operations into collection
         """
-        c = await coll._db_coll(session)
-        await c.bulk_write(
+        return await self.bulk_writer.write(
+            coll,
             ops,
-            ordered=True,
-            bypass_document_validation=True,
-            session=session._sess if session else None,
+            ordered=ordered,
+            session=session,
+        )
+
+    async def ainit_all(self):
+        """
+        Initialize (create if missing) every registered collection
+        """
+        colls = await self._db.list_collection_names()
+        await asyncio.gather(
+            *(c._db_coll(colls=colls) for c in self.__colls__.values())
         )
 
+    def init_all(self):
+        sync.run(self.ainit_all())
+
+    async def awatch(self, colls: list[Coll] | None = None) -> Watcher:
+        """
+        Invalidate cached data on changes made by other processes, through a
+        database-wide change stream or one stream per given collection
+        """
+        if self.__watcher__ is not None:
+            await self.__watcher__.astop()
+        self.__watcher__ = Watcher(self, colls)
+        await self.__watcher__.astart()
+        return self.__watcher__
+
+    async def aunwatch(self):
+        if self.__watcher__ is None:
+            return
+        await self.__watcher__.astop()
+        self.__watcher__ = None
+
+    def watch(self, colls: list[Coll] | None = None) -> Watcher:
+        return sync.run(self.awatch(colls))
+
+    def unwatch(self):
+        sync.run(self.aunwatch())
+
     def session(self) -> Session:
         return Session(self)
 
@@ -121,6 +189,13 @@ class Database:
         capped: bool = False,
         capped_size: int = 16 * (2**20),  # 16MB
         capped_max_docs: int = -1,
+        dereference: Dereference = "lookup",
+        track_changes: bool = True,
+        cache_size: int = 0,
+        cache_ttl: int = -1,
+        cache_max_bytes: int = -1,
+        cache_policy: CachePolicy = "lru",
+        read_mode: ReadMode = "validate",
         **options,
     ) -> Coll[T]:
         coll = Coll(
@@ -142,11 +217,62 @@ class Database:
             capped=capped,
             capped_size=capped_size,
             capped_max_docs=capped_max_docs,
+            dereference=dereference,
+            track_changes=track_changes,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_max_bytes=cache_max_bytes,
+            cache_policy=cache_policy,
+            read_mode=read_mode,
             **options,
         )
+        # replace re-registered collections
+        if coll.name in self.__colls__:
+            self.__refs__.remove(self.__colls__[coll.name])
         self.__colls__[coll.name] = coll
+        self.__refs__.add(coll)
         return coll
 
+    async def async_indexes(
+        self, drop: bool = False, dry_run: bool = False
+    ) -> dict[str, IndexPlan]:
+        """
+        Reconcile indexes of every registered collection, one collection at
+        a time
+        """
+        plans = {}
+        for name, coll in self.__colls__.items():
+            plans[name] = await coll.async_indexes(drop=drop, dry_run=dry_run)
+        return plans
+
+    def sync_indexes(
+        self, drop: bool = False, dry_run: bool = False
+    ) -> dict[str, IndexPlan]:
+        return sync.run(self.async_indexes(drop=drop, dry_run=dry_run))
+
+    def record_queries(self, explain_rate: float = 0.0) -> IndexAdvisor:
+        """
+        Record query shapes of every collection to suggest missing indexes,
+        explaining a `explain_rate` fraction of the queries
+        """
+        if self.__advisor__ is None:
+            self.__advisor__ = IndexAdvisor(explain_rate)
+        self.__advisor__.explain_rate = explain_rate
+        return self.__advisor__
+
+    def stop_recording(self) -> IndexAdvisor | None:
+        advisor, self.__advisor__ = self.__advisor__, None
+        return advisor
+
+    def reverse_references(self, coll: Coll) -> list[tuple[Coll, Ref]]:
+        return self.__refs__.reverse(coll)
+
+    def cascade_order(self, coll: Coll) -> list[Coll]:
+        return self.__refs__.cascade_order(coll)
+
+    def cascade_cycles(self) -> list[list[Coll]]:
+        return self.__refs__.cycles()
+
     def TimeSeriesCollection(
         self,
         model: Type[T],
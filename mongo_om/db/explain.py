@@ -0,0 +1,183 @@
+def winning_plans(explain: dict) -> list[dict]:
+    """
+    Get the winning plans of an explain output (one per query stage)
+    """
+    plans = []
+    if isinstance(explain, dict):
+        for k, val in explain.items():
+            if k == "winningPlan" and isinstance(val, dict):
+                # slot based engine plans
+                plans.append(val.get("queryPlan", val))
+            else:
+                plans.extend(winning_plans(val))
+    elif isinstance(explain, list):
+        for val in explain:
+            plans.extend(winning_plans(val))
+    return plans
+
+
+def plan_stages(plan: dict) -> list[dict]:
+    """
+    Flatten a plan stages tree (root first)
+    """
+    stages = [plan]
+    for child in plan.get("inputStages", []) + [plan.get("inputStage")]:
+        if isinstance(child, dict):
+            stages.extend(plan_stages(child))
+    return stages
+
+
+def scan_flags(explain: dict) -> tuple[bool, bool]:
+    """
+    Get whether an explained query scans the collection and sorts in memory
+    """
+    stages = [s.get("stage") for p in winning_plans(explain) for s in plan_stages(p)]
+    return "COLLSCAN" in stages, "SORT" in stages
+
+
+class StageSummary:
+    """
+    Summary of an explained pipeline stage
+    """
+
+    def __init__(self, name: str, coll: str | None = None):
+        self.name = name
+        self.coll = coll
+        self.plan: list[str] = []
+        self.indexes: list[str] = []
+        self.collscan = False
+        self.sort = False
+        self.docs_examined: int | None = None
+        self.keys_examined: int | None = None
+        self.returned: int | None = None
+        self.time_ms: int | None = None
+
+    def __repr__(self) -> str:
+        parts = [self.name]
+        if self.coll:
+            parts.append(f"[{self.coll}]")
+        if self.plan:
+            parts.append(" > ".join(self.plan))
+        if self.collscan and "COLLSCAN" not in self.plan:
+            parts.append("COLLSCAN")
+        if self.indexes:
+            parts.append(f"index={','.join(self.indexes)}")
+        for label, val in (
+            ("docs", self.docs_examined),
+            ("keys", self.keys_examined),
+            ("returned", self.returned),
+        ):
+            if val is not None:
+                parts.append(f"{label}={val}")
+        if self.time_ms is not None:
+            parts.append(f"{self.time_ms}ms")
+        return " ".join(parts)
+
+
+class ExplainSummary:
+    """
+    Parsed explain output of an aggregate: winning plan, indexes used, docs
+    examined vs returned and time of each stage
+    """
+
+    def __init__(self, coll: str, verbosity: str, explain: dict):
+        self.coll = coll
+        self.verbosity = verbosity
+        self.explain = explain
+        self.stages: list[StageSummary] = []
+
+    @property
+    def scans(self) -> list[str]:
+        # scanned collections
+        return [s.coll or self.coll for s in self.stages if s.collscan]
+
+    @property
+    def collscan(self) -> bool:
+        return bool(self.scans)
+
+    @property
+    def in_memory_sort(self) -> bool:
+        return any(s.sort or s.name == "$sort" for s in self.stages)
+
+    @property
+    def lookups(self) -> list[StageSummary]:
+        return [s for s in self.stages if s.name in ("$lookup", "$graphLookup")]
+
+    @property
+    def docs_examined(self) -> int:
+        return sum(s.docs_examined or 0 for s in self.stages)
+
+    @property
+    def returned(self) -> int | None:
+        for s in reversed(self.stages):
+            if s.returned is not None:
+                return s.returned
+        return None
+
+    def report(self) -> str:
+        lines = [f"{self.coll} ({self.verbosity}):"]
+        lines.extend(f"  {s!r}" for s in self.stages)
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.report()
+
+
+def parse_explain(coll: str, explain: dict, verbosity: str) -> ExplainSummary:
+    """
+    Summarize an aggregate explain output, either split in `stages` or
+    fully pushed down into the query layer
+    """
+    summary = ExplainSummary(coll, verbosity, explain)
+    if "stages" not in explain:
+        summary.stages.extend(_cursor_stages(coll, explain))
+        return summary
+    for stage in explain["stages"]:
+        name = next((k for k in stage if k.startswith("$")), "")
+        if name == "$cursor":
+            summary.stages.extend(_cursor_stages(coll, stage[name]))
+            continue
+        spec = stage.get(name)
+        s = StageSummary(name, spec.get("from") if isinstance(spec, dict) else None)
+        s.indexes = [i for i in stage.get("indexesUsed", []) if isinstance(i, str)]
+        s.collscan = bool(stage.get("collectionScans"))
+        s.docs_examined = stage.get("totalDocsExamined")
+        s.keys_examined = stage.get("totalKeysExamined")
+        s.returned = stage.get("nReturned")
+        s.time_ms = stage.get("executionTimeMillisEstimate")
+        summary.stages.append(s)
+    return summary
+
+
+def _cursor_stages(coll: str, data: dict) -> list[StageSummary]:
+    # query layer stage, plus the $lookup stages pushed down into it
+    stats = data.get("executionStats", {})
+    stages = [s for p in winning_plans(data) for s in plan_stages(p)]
+    cursor = StageSummary("$cursor", coll)
+    cursor.plan = [s["stage"] for s in stages if "stage" in s]
+    cursor.indexes = _indexes([s for s in stages if s.get("stage") != "EQ_LOOKUP"])
+    cursor.collscan = "COLLSCAN" in cursor.plan
+    cursor.sort = "SORT" in cursor.plan
+    cursor.docs_examined = stats.get("totalDocsExamined")
+    cursor.keys_examined = stats.get("totalKeysExamined")
+    cursor.returned = stats.get("nReturned")
+    cursor.time_ms = stats.get("executionTimeMillis")
+    lookups = []
+    for stage in stages:
+        if stage.get("stage") != "EQ_LOOKUP":
+            continue
+        s = StageSummary("$lookup", stage.get("foreignCollection"))
+        s.plan = [stage["strategy"]] if "strategy" in stage else []
+        s.indexes = [stage["indexName"]] if "indexName" in stage else []
+        s.collscan = stage.get("strategy") in ("NestedLoopJoin", "HashJoin")
+        lookups.append(s)
+    return [cursor, *lookups]
+
+
+def _indexes(stages: list[dict]) -> list[str]:
+    names = []
+    for s in stages:
+        name = "_id_" if s.get("stage") == "IDHACK" else s.get("indexName")
+        if name and name not in names:
+            names.append(name)
+    return names
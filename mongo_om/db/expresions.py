@@ -1,6 +1,6 @@
 from typing import Literal
 
-__all__ = ("Q", "asc", "desc")
+__all__ = ("Q", "U", "asc", "desc")
 
 
 class Query(dict[str, dict | list]):
@@ -99,3 +99,58 @@ def desc(*fields: str) -> Sort:
     for field in fields:
         s = s | Sort._desc(field)
     return s
+
+
+class Update(dict[str, dict]):
+
+    def __or__(self, other: "Update") -> "Update":  # type: ignore
+        update = Update({op: {**fields} for op, fields in self.items()})
+        for op, fields in other.items():
+            update[op] = {**update.get(op, {}), **fields}
+        return update
+
+    @classmethod
+    def _set(cls, field: str, value) -> "Update":
+        return cls({"$set": {field: value}})
+
+    @classmethod
+    def _unset(cls, field: str, value=True) -> "Update":
+        return cls({"$unset": {field: ""}})
+
+    @classmethod
+    def _inc(cls, field: str, value: int | float) -> "Update":
+        return cls({"$inc": {field: value}})
+
+    @classmethod
+    def _push(cls, field: str, value) -> "Update":
+        return cls({"$push": {field: value}})
+
+    @classmethod
+    def _push_all(cls, field: str, values: list) -> "Update":
+        return cls({"$push": {field: {"$each": values}}})
+
+    @classmethod
+    def _pull(cls, field: str, value) -> "Update":
+        return cls({"$pull": {field: value}})
+
+    @classmethod
+    def _min(cls, field: str, value) -> "Update":
+        return cls({"$min": {field: value}})
+
+    @classmethod
+    def _max(cls, field: str, value) -> "Update":
+        return cls({"$max": {field: value}})
+
+    @classmethod
+    def _current_date(cls, field: str, value=True) -> "Update":
+        return cls({"$currentDate": {field: value}})
+
+
+def U(**kwargs) -> Update:
+    u = Update()
+    for k, val in kwargs.items():
+        tokens = k.split("__")
+        field = ".".join(tokens[:-1])
+        op = getattr(Update, f"_{tokens[-1]}")
+        u = u | op(field, val)
+    return u
@@ -0,0 +1,110 @@
+from collections import defaultdict, deque
+from typing import TYPE_CHECKING
+
+from mongo_om.db.references import OnDelete, Ref
+
+if TYPE_CHECKING:
+    from .collection import Collection
+
+
+class RefGraph:
+    """
+    Reverse-references index of a database collections, maintained as
+    collections are registered
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._rev_refs: dict["Collection", list[tuple["Collection", Ref]]] = (
+            defaultdict(list)
+        )
+        self._plans: dict["Collection", tuple[list[tuple], dict]] = {}
+
+    def add(self, coll: "Collection"):
+        for ref in coll.refs:
+            if ref.coll is not coll and ref.coll.db is coll.db:
+                self._rev_refs[ref.coll].append((coll, ref))
+        self._changed()
+
+    def remove(self, coll: "Collection"):
+        for target, rev_refs in self._rev_refs.items():
+            self._rev_refs[target] = [(c, r) for c, r in rev_refs if c is not coll]
+        self._rev_refs.pop(coll, None)
+        self._changed()
+
+    def reverse(self, coll: "Collection") -> list[tuple["Collection", Ref]]:
+        return self._rev_refs.get(coll, [])
+
+    def delete_plan(self, coll: "Collection") -> tuple[list[tuple], dict]:
+        """
+        Get the (collection, ref, key field) reverse-references of a collection
+        and the projection of fields they need, computed once per collection
+        """
+        from .collection import MONGO_ID
+
+        plan = self._plans.get(coll)
+        if plan is None:
+            rev_refs = [
+                (c, r, coll._db_key_field(r.ref)) for c, r in self.reverse(coll)
+            ]
+            project = {MONGO_ID: 1, **{f: 1 for _, _, f in rev_refs}}
+            plan = self._plans[coll] = (rev_refs, project)
+        return plan
+
+    def cascade_order(self, coll: "Collection") -> list["Collection"]:
+        """
+        Get the collections affected by deletes on a collection, in
+        topological order (collections on cycles go last)
+        """
+        # collect affected subgraph (in discovery order)
+        nodes, queue = [coll], deque([coll])
+        while queue:
+            c = queue.popleft()
+            for rev_coll, _ in self.reverse(c):
+                if rev_coll not in nodes:
+                    nodes.append(rev_coll)
+                    queue.append(rev_coll)
+        # kahn's algorithm
+        degree = {c: 0 for c in nodes}
+        for c in nodes:
+            for rev_coll in {r for r, _ in self.reverse(c)}:
+                degree[rev_coll] += 1
+        order = []
+        queue = deque(c for c in nodes if degree[c] == 0)
+        while queue:
+            c = queue.popleft()
+            order.append(c)
+            for rev_coll in {r for r, _ in self.reverse(c)}:
+                degree[rev_coll] -= 1
+                if degree[rev_coll] == 0:
+                    queue.append(rev_coll)
+        return order + [c for c in nodes if c not in order]
+
+    def cycles(self) -> list[list["Collection"]]:
+        """
+        Get cascade-delete cycles
+        """
+        cycles = []
+        state = {}
+
+        def _visit(c: "Collection", path: list["Collection"]):
+            state[c] = 1
+            path.append(c)
+            for rev_coll, ref in self.reverse(c):
+                if ref.on_delete != OnDelete.CASCADE:
+                    continue
+                if state.get(rev_coll) == 1:
+                    cycles.append(path[path.index(rev_coll) :])
+                elif rev_coll not in state:
+                    _visit(rev_coll, path)
+            path.pop()
+            state[c] = 2
+
+        for c in list(self._rev_refs):
+            if c not in state:
+                _visit(c, [])
+        return cycles
+
+    def _changed(self):
+        self.version += 1
+        self._plans.clear()
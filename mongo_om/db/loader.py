@@ -0,0 +1,62 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, Iterable
+
+from mongo_om.db.session import Session
+
+if TYPE_CHECKING:
+    from .collection import Collection
+
+
+class Loader:
+    """
+    Coalesce the keys requested within an event-loop tick into a single
+    `$in` query (dataloader style)
+    """
+
+    def __init__(
+        self,
+        coll: "Collection",
+        field: str,
+        session: Session | None = None,
+    ):
+        self.coll = coll
+        self.field = field
+        self.session = session
+        self._pending: dict[Any, asyncio.Future] = {}
+
+    def load(self, key) -> asyncio.Future:
+        fut = self._pending.get(key)
+        if fut is None:
+            loop = asyncio.get_running_loop()
+            # dispatch pending keys on next loop tick
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            fut = self._pending[key] = loop.create_future()
+        return fut
+
+    async def load_many(self, keys: Iterable) -> dict:
+        futs = {k: self.load(k) for k in set(keys)}
+        data = await asyncio.gather(*futs.values())
+        return {k: d for k, d in zip(futs, data) if d is not None}
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        asyncio.ensure_future(self._fetch(pending))
+
+    async def _fetch(self, pending: dict[Any, asyncio.Future]):
+        try:
+            data = {}
+            cursor = self.coll.aggregate(
+                [{"$match": {self.field: {"$in": list(pending)}}}],
+                session=self.session,
+            )
+            async for d in cursor:
+                data[d[self.field]] = d
+        except Exception as e:
+            for fut in pending.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for k, fut in pending.items():
+            if not fut.done():
+                fut.set_result(data.get(k))
@@ -0,0 +1,87 @@
+import base64
+from typing import Generic
+
+import bson
+from bson import DEFAULT_CODEC_OPTIONS, CodecOptions
+
+from mongo_om.db.expresions import Query, Sort
+from mongo_om.types import T
+
+
+class Page(Generic[T]):
+    """
+    A page of keyset paginated data, with the tokens to get the next and
+    previous pages (None when there is no such page)
+    """
+
+    def __init__(self, items: list[T], next: str | None, prev: str | None):
+        self.items = items
+        self.next = next
+        self.prev = prev
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev is not None
+
+
+def encode_token(
+    values: list, codec_options: CodecOptions = DEFAULT_CODEC_OPTIONS
+) -> str:
+    data = bson.encode({"k": values}, codec_options=codec_options)
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_token(
+    token: str, size: int, codec_options: CodecOptions = DEFAULT_CODEC_OPTIONS
+) -> list:
+    try:
+        data = base64.urlsafe_b64decode(token.encode())
+        values = bson.decode(data, codec_options=codec_options)["k"]
+    except Exception:
+        raise ValueError("Invalid page token")
+    # token of other sort
+    if len(values) != size:
+        raise ValueError("Invalid page token")
+    return values
+
+
+def reverse_sort(sort: dict) -> Sort:
+    return Sort({k: -d for k, d in sort.items()})
+
+
+def build_keyset_query(sort: dict, values: list) -> Query:
+    """
+    Build the query of data after `values` on `sort` order, e.g. for
+    {a: 1, _id: 1} -> a > va or (a == va and _id > vid)
+    """
+    q = Query()
+    keys = list(sort.items())
+    for i, (field, direction) in enumerate(keys):
+        after = _after(field, direction, values[i])
+        if after is None:
+            continue
+        term = Query()
+        for (f, _), val in zip(keys[:i], values):
+            term = term & Query._eq(f, val)
+        q = q | (term & after)
+    return q
+
+
+def _after(field: str, direction: int, value) -> Query | None:
+    # null (and missing) values sort first, but $gt/$lt never match them
+    if direction == 1:
+        return Query._ne(field, None) if value is None else Query._gt(field, value)
+    # nothing sorts after null on descending order
+    if value is None:
+        return None
+    return Query._lt(field, value) | Query._eq(field, None)
@@ -0,0 +1,190 @@
+from typing import TYPE_CHECKING
+
+from mongo_om.db.projection import Projection, build_project_stage
+from mongo_om.db.references import (
+    Dereference,
+    Ref,
+    RefSelection,
+    is_dereferenced,
+)
+
+if TYPE_CHECKING:
+    from .collection import Collection
+
+LOGICAL_OPS = ("$and", "$or", "$nor")
+
+
+def query_fields(query: dict) -> set[str]:
+    """
+    Get the field paths touched by a query
+    """
+    fields = set()
+    for k, val in query.items():
+        if k in LOGICAL_OPS:
+            for q in val:
+                fields |= query_fields(q)
+        elif k == "$not":
+            fields |= query_fields(val)
+        elif k == "$expr":
+            fields |= expr_fields(val)
+        elif not k.startswith("$"):
+            fields.add(k)
+    return fields
+
+
+def expr_fields(expr) -> set[str]:
+    """
+    Get the field paths referenced ("$field") by an aggregation expression
+    """
+    fields = set()
+    if isinstance(expr, str):
+        if expr.startswith("$") and not expr.startswith("$$"):
+            fields.add(expr[1:])
+    elif isinstance(expr, dict):
+        for val in expr.values():
+            fields |= expr_fields(val)
+    elif isinstance(expr, list):
+        for val in expr:
+            fields |= expr_fields(val)
+    return fields
+
+
+def split_conjuncts(query: dict) -> list[dict]:
+    """
+    Split a query into its top-level AND terms
+    """
+    conj = []
+    for k, val in query.items():
+        if k == "$and":
+            for q in val:
+                conj.extend(split_conjuncts(q))
+        else:
+            conj.append({k: val})
+    return conj
+
+
+def merge_conjuncts(conj: list[dict]) -> dict:
+    """
+    Join AND terms back into a single query
+    """
+    query = {}
+    for q in conj:
+        if any(k in query for k in q):
+            return {"$and": conj}
+        query.update(q)
+    return query
+
+
+def field_refs(refs: list[Ref], field: str) -> list[str]:
+    """
+    Get the reference paths a field path walks through, e.g. for
+    `author.company.name` -> [`author`, `author.company`]
+    """
+    paths = []
+    tokens = field.split(".")
+    for i, token in enumerate(tokens):
+        ref = next((r for r in refs if r.field == token), None)
+        if ref is None:
+            break
+        paths.append(".".join(tokens[: i + 1]))
+        refs = ref.coll.refs
+    return paths
+
+
+def query_refs(coll: "Collection", filter: dict) -> set[str]:
+    """
+    Get the reference paths a (stored fields) query depends on
+    """
+    return {
+        p
+        for f in query_fields(coll._db_query(filter))
+        for p in field_refs(coll.refs, f)
+    }
+
+
+def build_fetch_pipeline(
+    coll: "Collection",
+    filter: dict = {},
+    sort: dict = {},
+    skip: int = 0,
+    limit: int = -1,
+    selection: RefSelection | None = None,
+    dereference: Dereference = "lookup",
+    projection: Projection | None = None,
+) -> list[dict]:
+    """
+    Build the fetch pipeline, running every stage that doesn't depend on
+    dereferenced fields ahead of the $lookup stages, and projecting fields
+    inside the $lookup stages
+    """
+    refs = coll.refs
+    refs_idx = {ref.field: i for i, ref in enumerate(refs)}
+
+    def _refs_idx(fields: set[str]) -> list[int]:
+        roots = (f.split(".")[0] for f in fields)
+        return [refs_idx[r] for r in roots if r in refs_idx]
+
+    # place each filter term after the last reference it depends on
+    pre_match = []
+    post_match = [[] for _ in refs]
+    fields = set()
+    for q in split_conjuncts(coll._db_query(filter)):
+        q_fields = query_fields(q)
+        idx = _refs_idx(q_fields)
+        if idx:
+            post_match[max(idx)].append(q)
+        else:
+            pre_match.append(q)
+        fields |= q_fields
+    sort = coll._db_sort(sort)
+    pre_sort = not _refs_idx(set(sort))
+    pre_page = pre_sort and not any(post_match)
+    # always $lookup the references the query depends on
+    fields |= set(sort)
+    forced = {p for f in fields for p in field_refs(refs, f)}
+    if dereference == "batch":
+        selection = RefSelection(include=(), force=forced)
+    elif selection is not None:
+        selection = selection.forcing(forced)
+    # $lookup projections keep the fields the query depends on
+    lookup_proj = projection.extending(fields) if projection is not None else None
+
+    pipeline = []
+    if pre_match:
+        pipeline.append({"$match": merge_conjuncts(pre_match)})
+    if sort and pre_sort:
+        pipeline.append({"$sort": sort})
+    if pre_page:
+        pipeline.extend(build_page_stages(skip, limit))
+    # dereference stages
+    for ref, q in zip(refs, post_match):
+        if not is_dereferenced(ref, ref.field, selection):
+            continue
+        if lookup_proj is not None and ref.field not in lookup_proj.fields:
+            continue
+        # compiled stages are shared between pipelines
+        pipeline.extend(
+            coll._db_reference_stages(
+                ref,
+                selection,
+                projection=lookup_proj.at(ref.field) if lookup_proj else None,
+            )
+        )
+        if q:
+            pipeline.append({"$match": merge_conjuncts(q)})
+    if sort and not pre_sort:
+        pipeline.append({"$sort": sort})
+    if not pre_page:
+        pipeline.extend(build_page_stages(skip, limit))
+    if projection is not None:
+        pipeline.append(build_project_stage(coll, projection))
+    return pipeline
+
+
+def build_page_stages(skip: int = 0, limit: int = -1) -> list[dict]:
+    stages = []
+    if skip > 0:
+        stages.append({"$skip": skip})
+    if limit > 0:
+        stages.append({"$limit": limit})
+    return stages
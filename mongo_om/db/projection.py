@@ -0,0 +1,80 @@
+import types
+from typing import TYPE_CHECKING, Iterable, Type, Union, get_args, get_origin
+
+import pydantic
+
+if TYPE_CHECKING:
+    from .collection import Collection
+
+
+class Projection:
+    """
+    Fields returned by a query, as field names (`author.name` like paths
+    project dereferenced fields) or the fields of a sub-model
+    """
+
+    def __init__(self, fields: Iterable[str] | Type[pydantic.BaseModel]):
+        self.model = None
+        if isinstance(fields, type):
+            self.model = fields
+            fields = _model_paths(fields)
+        self.paths = frozenset(fields)
+        self.fields = frozenset(p.split(".")[0] for p in self.paths)
+
+    def at(self, field: str) -> "Projection | None":
+        """
+        Get the projection of a reference field, None for whole data
+        """
+        if field in self.paths:
+            return None
+        return Projection(
+            p[len(field) + 1 :] for p in self.paths if p.startswith(f"{field}.")
+        )
+
+    def extending(self, paths: Iterable[str]) -> "Projection":
+        proj = Projection([*self.paths, *paths])
+        proj.model = self.model
+        return proj
+
+
+def _model_paths(model: Type[pydantic.BaseModel], seen: tuple = ()) -> list[str]:
+    # walk into sub-models (e.g. a partial model of a reference)
+    paths = []
+    for name, field in model.model_fields.items():
+        sub = _sub_model(field.annotation)
+        sub_paths = (
+            _model_paths(sub, (*seen, model))
+            if sub is not None and sub not in seen
+            else []
+        )
+        paths.extend([f"{name}.{p}" for p in sub_paths] or [name])
+    return paths
+
+
+def _sub_model(annotation) -> Type[pydantic.BaseModel] | None:
+    if isinstance(annotation, type) and issubclass(annotation, pydantic.BaseModel):
+        return annotation
+    # unwrap optional and list types
+    if get_origin(annotation) in (Union, types.UnionType, list):
+        for arg in get_args(annotation):
+            sub = _sub_model(arg)
+            if sub is not None:
+                return sub
+    return None
+
+
+def build_project_stage(coll: "Collection", projection: Projection) -> dict:
+    from .collection import MONGO_ID
+
+    project = {MONGO_ID: 1}
+    for field in projection.fields:
+        ref = next((r for r in coll.refs if r.field == field), None)
+        if ref is not None:
+            project[ref.local] = 1
+            project[ref.field] = 1
+        elif field in coll.model.model_fields:
+            project[coll._db_key_field(field)] = 1
+        # stored (e.g. queried) fields
+        else:
+            project[field] = 1
+    return {"$project": project}
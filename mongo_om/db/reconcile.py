@@ -0,0 +1,147 @@
+from collections import defaultdict
+
+import pymongo
+
+# index options compared between declared and existing indexes
+COMPARED_OPTIONS = (
+    "unique",
+    "sparse",
+    "partialFilterExpression",
+    "expireAfterSeconds",
+    "collation",
+    "weights",
+    "hidden",
+)
+
+
+class IndexPlan:
+    """
+    Changes to turn the existing indexes of a collection into the declared
+    ones
+    """
+
+    def __init__(self, coll: str):
+        self.coll = coll
+        self.create: list[pymongo.IndexModel] = []
+        self.rebuild: list[tuple[dict, pymongo.IndexModel]] = []
+        self.drop: list[dict] = []
+        self.ok: list[pymongo.IndexModel] = []
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.create or self.rebuild or self.drop)
+
+    def report(self) -> str:
+        lines = [f"{self.coll}:"]
+        for model in self.create:
+            lines.append(f"  create {_describe(model.document)}")
+        for info, model in self.rebuild:
+            lines.append(f"  rebuild {info['name']} -> {_describe(model.document)}")
+        for info in self.drop:
+            lines.append(f"  drop {_describe(info)}")
+        if not self.changed:
+            lines.append("  up to date")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.report()
+
+
+def build_index_plan(
+    coll: str,
+    declared: list[pymongo.IndexModel],
+    existing: list[dict],
+) -> IndexPlan:
+    """
+    Diff declared indexes against `list_indexes` data, matching them by
+    key spec, collation, partial filter and name (indexes on the same keys
+    may differ on those) and comparing their options
+    """
+    plan = IndexPlan(coll)
+    existing = [i for i in existing if i["name"] != "_id_"]
+    by_key = defaultdict(list)
+    for info in existing:
+        by_key[_key_spec(info["key"])].append(info)
+    # match best candidates first: same identity and name, same identity,
+    # same name, then any index on the same keys
+    matches: dict[int, dict] = {}
+    matched = set()
+    for rule in (
+        lambda s, i: _identity(s) == _identity(i, s) and s["name"] == i["name"],
+        lambda s, i: _identity(s) == _identity(i, s),
+        lambda s, i: s["name"] == i["name"],
+        lambda s, i: True,
+    ):
+        for n, model in enumerate(declared):
+            if n in matches:
+                continue
+            spec = model.document
+            for info in by_key[_key_spec(spec["key"])]:
+                if info["name"] not in matched and rule(spec, info):
+                    matches[n] = info
+                    matched.add(info["name"])
+                    break
+    for n, model in enumerate(declared):
+        spec, info = model.document, matches.get(n)
+        if info is None:
+            plan.create.append(model)
+        elif _options(spec) == _options(info, like=spec):
+            plan.ok.append(model)
+        else:
+            plan.rebuild.append((info, model))
+    plan.drop = [i for i in existing if i["name"] not in matched]
+    return plan
+
+
+def _identity(spec: dict, like: dict | None = None) -> dict:
+    # options telling apart indexes on the same keys
+    options = _options(spec, like)
+    return {k: options.get(k) for k in ("collation", "partialFilterExpression")}
+
+
+def _key_spec(key) -> tuple:
+    # normalize key spec, text keys are stored as _fts/_ftsx keys
+    spec = []
+    for field, direction in dict(key).items():
+        if direction == pymongo.TEXT or field in ("_fts", "_ftsx"):
+            if ("_fts", "text") not in spec:
+                spec.extend([("_fts", "text"), ("_ftsx", 1)])
+            continue
+        if isinstance(direction, float) and direction.is_integer():
+            direction = int(direction)
+        spec.append((field, direction))
+    return tuple(spec)
+
+
+def _options(spec: dict, like: dict | None = None) -> dict:
+    options = {}
+    for name in COMPARED_OPTIONS:
+        val = spec.get(name)
+        # default text weights
+        if name == "weights" and val is None and like is None:
+            text = [f for f, d in dict(spec["key"]).items() if d == pymongo.TEXT]
+            val = {f: 1 for f in text} or None
+        # existing collation has every option, compare the declared ones
+        if name == "collation" and like is not None:
+            declared = like.get("collation")
+            if declared is None:
+                val = None
+            elif val is not None:
+                declared = _document(declared)
+                val = {k: v for k, v in val.items() if k in declared}
+        if name == "collation" and val is not None:
+            val = _document(val)
+        if val:
+            options[name] = val
+    return options
+
+
+def _document(val) -> dict:
+    # collation objects to dicts
+    return val.document if hasattr(val, "document") else dict(val)
+
+
+def _describe(spec: dict) -> str:
+    key = ", ".join(f"{f}: {d}" for f, d in dict(spec["key"]).items())
+    options = _options(spec)
+    return f"{spec.get('name', '')} {{{key}}}" + (f" {options}" if options else "")
@@ -1,10 +1,17 @@
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Literal
+
+from mongo_om.db.projection import Projection, build_project_stage
 
 if TYPE_CHECKING:
     from .collection import Collection
 
 
+Dereference = Literal["lookup", "batch"]
+# referenced data saved on save: all, only new or modified, or none
+Cascade = Literal["all", "changed", "none"]
+
+
 class OnDelete(Enum):
     CASCADE = 0
     SET_NULL = 1
@@ -21,6 +28,7 @@ class Ref:
         local: str | None = None,
         many: bool = False,
         on_delete: OnDelete = OnDelete.CASCADE,
+        cascade: Cascade | None = None,
     ):
         self.field = field
         self.coll = coll
@@ -28,6 +36,7 @@ class Ref:
         self.local = local or f"{field}_{ref}"
         self.many = many
         self.on_delete = on_delete
+        self.cascade = cascade
 
 
 class RefMany(Ref):
@@ -39,6 +48,7 @@ class RefMany(Ref):
         ref: str = "id",
         local: str | None = None,
         on_delete: OnDelete = OnDelete.SET_NULL,
+        cascade: Cascade | None = None,
     ):
         super().__init__(
             field,
@@ -47,68 +57,153 @@ class RefMany(Ref):
             local,
             many=True,
             on_delete=on_delete,
+            cascade=cascade,
         )
 
 
-def build_dereference_pipeline(refs: list[Ref]) -> list[dict]:
+class RefSelection:
+    """
+    Select which reference paths (e.g. `author`, `author.company`) are
+    dereferenced by a query, not selected ones are loaded as unloaded refs
+    """
+
+    def __init__(
+        self,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] = (),
+        force: Iterable[str] = (),
+    ):
+        self.include = frozenset(include) if include is not None else None
+        self.exclude = frozenset(exclude)
+        self.force = frozenset(force)
+
+    def __contains__(self, path: str) -> bool:
+        if any(_is_prefix(path, f) for f in self.force):
+            return True
+        if any(_is_prefix(e, path) for e in self.exclude):
+            return False
+        if self.include is None:
+            return True
+        return any(_is_prefix(path, i) for i in self.include)
+
+    def forcing(self, paths: Iterable[str]) -> "RefSelection":
+        return RefSelection(self.include, self.exclude, self.force | set(paths))
+
+
+def _is_prefix(prefix: str, path: str) -> bool:
+    return path == prefix or path.startswith(f"{prefix}.")
+
+
+def is_loaded(data) -> bool:
+    return getattr(data, "_om_loaded", True)
+
+
+def is_dereferenced(
+    ref: Ref,
+    path: str,
+    selection: RefSelection | None = None,
+) -> bool:
+    # only models tracking its loaded state can be left unloaded
+    if selection is None or not can_unload(ref.coll):
+        return True
+    return path in selection
+
+
+def can_unload(coll: "Collection") -> bool:
+    return "_om_loaded" in coll.model.__private_attributes__
+
+
+def build_reference_stages(
+    ref: Ref,
+    selection: RefSelection | None = None,
+    path: str | None = None,
+    projection: Projection | None = None,
+) -> list[dict]:
     from .collection import MONGO_ID
 
-    pipeline = []
-    for ref in refs:
-        foreing_f = (
-            MONGO_ID if ref.ref == ref.coll.id_field else ref.coll._db_field(ref.ref)
-        )
-        pipeline.append(
+    path = path or ref.field
+
+    stages = []
+    foreing_f = ref.coll._db_key_field(ref.ref)
+    stages.append(
+        {
+            "$lookup": {
+                "from": ref.coll.name,
+                "localField": ref.local,
+                "foreignField": foreing_f,
+                "pipeline": [
+                    *(
+                        [build_project_stage(ref.coll, projection)]
+                        if projection is not None
+                        else []
+                    ),
+                    *build_dereference_pipeline(
+                        ref.coll.refs,
+                        selection,
+                        prefix=f"{path}.",
+                        projection=projection,
+                    ),
+                    # map MONGO_ID to id field
+                    {"$set": {ref.coll._db_id_field(): f"${MONGO_ID}"}},
+                    *([{"$limit": 1}] if not ref.many else []),
+                ],
+                "as": ref.field,
+            }
+        }
+    )
+    # set null to not-dereferenced values
+    if ref.on_delete == OnDelete.SET_NULL:
+        stages.append(
             {
-                "$lookup": {
-                    "from": ref.coll.name,
-                    "localField": ref.local,
-                    "foreignField": foreing_f,
-                    "pipeline": [
-                        *build_dereference_pipeline(ref.coll.refs),
-                        *([{"$limit": 1}] if not ref.many else []),
-                    ],
-                    "as": ref.field,
-                }
+                "$addFields": {
+                    ref.field: {
+                        "$cond": {
+                            "if": {"$eq": [f"${ref.field}", []]},
+                            "then": [] if ref.many else [None],
+                            "else": f"${ref.field}",
+                        }
+                    }  # type: ignore
+                },
             }
         )
-        # set null to not-dereferenced values
-        if ref.on_delete == OnDelete.SET_NULL:
-            pipeline.append(
-                {
-                    "$addFields": {
-                        ref.field: {
-                            "$cond": {
-                                "if": {"$eq": [f"${ref.field}", []]},
-                                "then": [] if ref.many else [None],
-                                "else": f"${ref.field}",
-                            }
-                        }  # type: ignore
-                    },
+    # unwind reference values
+    if not ref.many:
+        stages.append(
+            {
+                "$unwind": {
+                    "path": f"${ref.field}",
+                    "preserveNullAndEmptyArrays": True,  # type: ignore
                 }
+            }  # type: ignore
+        )
+    return stages
+
+
+def build_dereference_pipeline(
+    refs: list[Ref],
+    selection: RefSelection | None = None,
+    prefix: str = "",
+    projection: Projection | None = None,
+) -> list[dict]:
+    pipeline = []
+    for ref in refs:
+        path = f"{prefix}{ref.field}"
+        if not is_dereferenced(ref, path, selection):
+            continue
+        # not projected reference
+        if projection is not None and ref.field not in projection.fields:
+            continue
+        pipeline.extend(
+            build_reference_stages(
+                ref,
+                selection,
+                path,
+                projection=projection.at(ref.field) if projection else None,
             )
-        # unwind reference values
-        if not ref.many:
-            pipeline.append(
-                {
-                    "$unwind": {
-                        "path": f"${ref.field}",
-                        "preserveNullAndEmptyArrays": True,  # type: ignore
-                    }
-                }  # type: ignore
-            )
-        # map MONGO_ID to id field
-        pipeline.append({"$set": {ref.coll.id_field: f"${MONGO_ID}"}})  # type: ignore
+        )
     return pipeline
 
 
 def get_reverse_references(coll: "Collection") -> list[tuple]:
-    # get all sibling colls (colls in same coll's db)
-    colls = (c for c in coll.db.__colls__.values() if c is not coll)
-    # get colls that refers to coll
-    rev_refs = []
-    for c in colls:
-        for ref in c.refs:
-            if ref.coll is coll:
-                rev_refs.append((c, ref))
-    return rev_refs
+    # get colls that refers to coll (in same coll's db)
+    return coll.db.__refs__.reverse(coll)
@@ -0,0 +1,61 @@
+from collections import defaultdict
+
+
+def build_update(old: dict, new: dict) -> dict | None:
+    """
+    Build the minimal $set/$unset/$push update turning `old` into `new`,
+    or None when it can't be expressed as an update
+    """
+    if not _safe_keys(new) or not _safe_keys(old):
+        return None
+    update = defaultdict(dict)
+    _diff(old, new, "", update)
+    return dict(update)
+
+
+def _diff(old: dict, new: dict, prefix: str, update: dict):
+    for k, val in new.items():
+        path = f"{prefix}{k}"
+        if k not in old:
+            update["$set"][path] = val
+            continue
+        prev = old[k]
+        if _equals(prev, val):
+            continue
+        # walk into embedded documents
+        if isinstance(val, dict) and isinstance(prev, dict):
+            if _safe_keys(val) and _safe_keys(prev):
+                _diff(prev, val, f"{path}.", update)
+            else:
+                update["$set"][path] = val
+        # push appended items
+        elif (
+            isinstance(val, list)
+            and isinstance(prev, list)
+            and len(val) > len(prev)
+            and _equals(prev, val[: len(prev)])
+        ):
+            update["$push"][path] = {"$each": val[len(prev) :]}
+        else:
+            update["$set"][path] = val
+    for k in old:
+        if k not in new:
+            update["$unset"][f"{prefix}{k}"] = ""
+
+
+def _equals(a, b) -> bool:
+    # bool is an int subclass, but they are different BSON types
+    if isinstance(a, bool) != isinstance(b, bool):
+        return False
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_equals(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_equals(i, j) for i, j in zip(a, b))
+    return a == b
+
+
+def _safe_keys(data: dict) -> bool:
+    # keys that can be used on update paths
+    return all(
+        isinstance(k, str) and "." not in k and not k.startswith("$") for k in data
+    )
@@ -0,0 +1,120 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+if TYPE_CHECKING:
+    from .collection import Collection
+    from .database import Database
+
+WATCHED_OPS = [
+    "update",
+    "replace",
+    "delete",
+    "drop",
+    "rename",
+    "dropDatabase",
+    "invalidate",
+]
+# the resume token is no longer in the oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+class Watcher:
+    """
+    Invalidate cached data from change streams, either a database-wide
+    stream or one stream per watched collection
+    """
+
+    def __init__(
+        self,
+        db: "Database",
+        colls: list["Collection"] | None = None,
+        retry_delay: float = 1.0,
+    ):
+        self.db = db
+        self.colls = colls
+        self.retry_delay = retry_delay
+        self.resume_tokens: dict[str | None, dict | None] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return any(not t.done() for t in self._tasks)
+
+    async def astart(self):
+        if self.running:
+            return
+        if self.colls is None:
+            targets = [None]
+        else:
+            targets = [c for c in self.colls if c.cache is not None]
+        self._tasks = [asyncio.ensure_future(self._watch(c)) for c in targets]
+
+    async def astop(self):
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _stream(self, coll: "Collection | None", resume_token: dict | None):
+        pipeline = [{"$match": {"operationType": {"$in": WATCHED_OPS}}}]
+        src = self.db._db if coll is None else await coll._db_coll()
+        return src.watch(pipeline, resume_after=resume_token)
+
+    async def _watch(self, coll: "Collection | None"):
+        name = coll.name if coll is not None else None
+        started = False
+        while True:
+            try:
+                resume_token = self.resume_tokens.get(name)
+                # changes made while reconnecting are unknown
+                if started and resume_token is None:
+                    self._clear(coll)
+                started = True
+                stream = await self._stream(coll, resume_token)
+                async with stream:
+                    while stream.alive:
+                        change = await stream.try_next()
+                        if change is not None:
+                            self._invalidate(change, coll)
+                        # keep the token on empty batches (postBatchResumeToken)
+                        if stream.resume_token is not None:
+                            self.resume_tokens[name] = stream.resume_token
+                        # stream closed by server (e.g. dropped collection)
+                        if (
+                            change is not None
+                            and change["operationType"] == "invalidate"
+                        ):
+                            self.resume_tokens[name] = None
+                            break
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                # changes may be lost, so start again from a clean cache
+                if (
+                    isinstance(e, OperationFailure)
+                    and e.code == CHANGE_STREAM_HISTORY_LOST
+                ):
+                    self.resume_tokens[name] = None
+                    self._clear(coll)
+                await asyncio.sleep(self.retry_delay)
+
+    def _invalidate(self, change: dict, coll: "Collection | None" = None):
+        name = change.get("ns", {}).get("coll")
+        if name is not None:
+            coll = self.db.__colls__.get(name)
+            # not a registered collection
+            if coll is None:
+                return
+        if change["operationType"] in ("update", "replace", "delete"):
+            if coll is not None and coll.cache is not None:
+                coll.cache.invalidate(change["documentKey"]["_id"])
+        else:
+            self._clear(coll)
+
+    def _clear(self, coll: "Collection | None"):
+        colls = [coll] if coll is not None else self.db.__colls__.values()
+        for c in colls:
+            if c.cache is not None:
+                c.cache.clear()
@@ -12,8 +12,11 @@ from pymongo.read_concern import ReadConcern
 from pymongo.read_preferences import _ServerMode
 
 from mongo_om import sync
+from mongo_om.db.bulk import BulkResult
+from mongo_om.db.cache import CachePolicy
 from mongo_om.db.collection import Collection
-from mongo_om.db.references import Ref
+from mongo_om.db.cursor import ReadMode
+from mongo_om.db.references import Cascade, Dereference, Ref
 from mongo_om.db.session import Session
 from mongo_om.types import ObjectId
 
@@ -41,6 +44,13 @@ class OMConfig(TypedDict, total=False):
     capped: bool
     capped_size: int
     capped_max_docs: int
+    dereference: Dereference
+    track_changes: bool
+    cache_size: int
+    cache_ttl: int
+    cache_max_bytes: int
+    cache_policy: CachePolicy
+    read_mode: ReadMode
 
 
 class _DocumentMeta(_model_construction.ModelMetaclass):
@@ -83,6 +93,13 @@ class _DocumentMeta(_model_construction.ModelMetaclass):
             capped=_config.get("capped", False),
             capped_size=_config.get("capped_size", 16 * (2**20)),
             capped_max_docs=_config.get("capped_max_docs", -1),
+            dereference=_config.get("dereference", "lookup"),
+            track_changes=_config.get("track_changes", True),
+            cache_size=_config.get("cache_size", 0),
+            cache_ttl=_config.get("cache_ttl", -1),
+            cache_max_bytes=_config.get("cache_max_bytes", -1),
+            cache_policy=_config.get("cache_policy", "lru"),
+            read_mode=_config.get("read_mode", "validate"),
         )
         # set Document class vars
         setattr(_cls, "om_config", OMConfig(**_config))
@@ -101,25 +118,84 @@ class Document(pydantic.BaseModel, metaclass=_DocumentMeta):
     id: ObjectId = pydantic.Field(default_factory=bson.ObjectId)
     om_config: ClassVar[OMConfig]
     collection: ClassVar[Collection[Self]]
+    _om_loaded: bool = pydantic.PrivateAttr(default=True)
+    _om_snapshot: dict | None = pydantic.PrivateAttr(default=None)
+    _om_persisted: bool = pydantic.PrivateAttr(default=False)
+    _om_partial: frozenset[str] | None = pydantic.PrivateAttr(default=None)
+
+    @property
+    def om_loaded(self) -> bool:
+        return self._om_loaded
+
+    @property
+    def om_persisted(self) -> bool:
+        return self._om_persisted
+
+    @property
+    def om_partial(self) -> bool:
+        return self._om_partial is not None
+
+    @property
+    def om_changes(self) -> dict | None:
+        """
+        Changes since load or last save as an update document ($set, $unset,
+        $push), None for not tracked (e.g. new) documents
+        """
+        return self.collection._db_changes(self)
+
+    @property
+    def om_modified(self) -> bool:
+        return self.om_changes != {}
 
     @classmethod
     async def acreate(cls, data: dict, session: Session | None = None) -> Self:
-        doc = cls(**data)
-        await doc.asave(session)
-        return doc
+        docs = await cls.collection.acreate_many([cls(**data)], session=session)
+        return docs[0]
 
-    async def asave(self, session: Session | None = None):
-        await self.collection.asave(self, session=session)  # type: ignore
+    @classmethod
+    async def acreate_many(
+        cls, data: list[dict], session: Session | None = None
+    ) -> list[Self]:
+        return await cls.collection.acreate_many(data, session=session)  # type: ignore
+
+    async def asave(
+        self,
+        session: Session | None = None,
+        cascade: Cascade = "all",
+        allow_partial: bool = False,
+    ) -> BulkResult:
+        return await self.collection.asave(
+            self, session=session, cascade=cascade, allow_partial=allow_partial  # type: ignore
+        )
 
     async def adelete(self, session: Session | None = None):
         await self.collection.adelete(self, session=session)  # type: ignore
 
+    async def aload_refs(self, *paths: str, session: Session | None = None):
+        await self.collection.aload_refs(self, list(paths), session=session)  # type: ignore
+
     @classmethod
     def create(cls, data: dict, session: Session | None = None) -> Self:
         return sync.run(cls.acreate(data, session=session))
 
-    def save(self, session: Session | None = None):
-        self.collection.save(self, session=session)  # type: ignore
+    @classmethod
+    def create_many(
+        cls, data: list[dict], session: Session | None = None
+    ) -> list[Self]:
+        return sync.run(cls.acreate_many(data, session=session))
+
+    def save(
+        self,
+        session: Session | None = None,
+        cascade: Cascade = "all",
+        allow_partial: bool = False,
+    ) -> BulkResult:
+        return self.collection.save(
+            self, session=session, cascade=cascade, allow_partial=allow_partial  # type: ignore
+        )
 
     def delete(self, session: Session | None = None):
         self.collection.delete(self, session=session)  # type: ignore
+
+    def load_refs(self, *paths: str, session: Session | None = None):
+        self.collection.load_refs(self, list(paths), session=session)  # type: ignore
@@ -4,3 +4,25 @@ class DatabaseError(Exception):
 
 class SessionError(Exception):
     pass
+
+
+class PartialDataError(Exception):
+    pass
+
+
+class BulkWriteError(DatabaseError):
+
+    def __init__(self, result):
+        self.result = result
+        super().__init__(f"Bulk write failed with {len(result.errors)} errors")
+
+
+class CollectionScanWarning(UserWarning):
+    pass
+
+
+class CollectionScanError(DatabaseError):
+
+    def __init__(self, summary):
+        self.summary = summary
+        super().__init__(f"Query scans collections: {', '.join(summary.scans)}")
@@ -1,6 +1,35 @@
 import asyncio
+import threading
 from typing import Coroutine
 
+_loop: asyncio.AbstractEventLoop | None = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop running the sync api, on a background (daemon) thread
+    """
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="mongo-om-sync",
+                daemon=True,
+            ).start()
+        return _loop
+
 
 def run(coro: Coroutine):
-    return asyncio.get_event_loop().run_until_complete(coro)
+    loop = get_loop()
+    # waiting from the loop thread would block it forever
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("sync api can't be used from its own event loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()